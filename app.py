@@ -1,3 +1,4 @@
+import pandas as pd
 import streamlit as st
 from auth.login import AuthManager
 from app_sections.dashboard_individual import render_dashboard_individual
@@ -12,6 +13,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Copy-on-Write: os DataFrames em cache (st.cache_resource) são
+# compartilhados entre sessões; escrever em uma visão ou cópia rasa
+# (compartilhar) copia só a coluna alterada e nunca altera o cache
+pd.set_option('mode.copy_on_write', True)
+
 # CSS customizado
 st.markdown("""
 <style>
@@ -95,7 +101,8 @@ def main():
         if selected_page == "📊 Meu Dashboard":
             render_dashboard_individual(user['parceiro'])
         elif selected_page == "📋 Relatórios e Metas":
-            render_relatorios_metas(user['parceiro'])
+            render_relatorios_metas(user['parceiro'],
+                                    admin=auth_manager.is_admin())
         elif selected_page == "🌍 Dashboard Público":
             render_dashboard_publico()
 
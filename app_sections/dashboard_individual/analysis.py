@@ -1,11 +1,6 @@
 # Análise Avançada
 import streamlit as st
 import pandas as pd
-from data.fetch_data import (
-    get_modalidades_parceiro_filtradas,
-    get_cursos_parceiro_filtrados,
-    get_modalidades_parceiro_unica
-)
 from utils.graphs import (
     create_modalidades_parceiro_bar_chart,
     create_modalidades_parceiro_pie_chart,
@@ -16,26 +11,21 @@ from utils.graphs import (
 from typing import Dict, Any, Optional
 
 
-def render_general_analysis(parceiro_nome: str,
-                            ano_analise: Optional[int],
-                            mes_analise: Optional[int],
+def render_general_analysis(pacote: Dict[str, Any],
                             modalidade_selecionada: str,
-                            periodo_texto: str,
-                            stats_data: Dict[str, Any]) -> None:
+                            periodo_texto: str) -> None:
     """
     Renderiza análise geral (visão geral)
     """
     if modalidade_selecionada and modalidade_selecionada != "Todas":
-        _render_specific_modality_analysis(parceiro_nome, ano_analise,
-                                           mes_analise, modalidade_selecionada,
-                                           periodo_texto, stats_data)
+        _render_specific_modality_analysis(pacote, modalidade_selecionada,
+                                           periodo_texto)
     else:
-        _render_all_modalities_analysis(
-            parceiro_nome, ano_analise, mes_analise, periodo_texto)
+        _render_all_modalities_analysis(pacote, periodo_texto)
 
 
 def render_comparative_analysis(
-        parceiro_nome: str,
+        pacote: Dict[str, Any],
         mes_analise: Optional[int],
         modalidade_selecionada: str) -> None:
     """
@@ -47,11 +37,11 @@ def render_comparative_analysis(
         9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
     }
 
+    comparativo = pacote.get('comparativo') or {}
+    modalidades_2025 = comparativo.get('ano')
+    modalidades_mes = comparativo.get('mes')
+
     if modalidade_selecionada and modalidade_selecionada != "Todas":
-        modalidades_2025 = get_modalidades_parceiro_unica(
-            parceiro_nome, 2025, None, modalidade_selecionada)
-        modalidades_mes = get_modalidades_parceiro_unica(
-            parceiro_nome, 2025, mes_analise, modalidade_selecionada)
 
         if modalidades_2025 and modalidades_mes:
             fig_comparativo = create_modalidades_evolucao_chart(
@@ -65,19 +55,12 @@ def render_comparative_analysis(
                 f"Dados insuficientes para comparativo da modalidade {
                     modalidade_selecionada}")
     else:
-        modalidades_2025 = get_modalidades_parceiro_filtradas(
-            parceiro_nome, 2025, None)
-        modalidades_mes = get_modalidades_parceiro_filtradas(
-            parceiro_nome, 2025, mes_analise)
-
         fig_comparativo = create_modalidades_evolucao_chart(
             modalidades_2025, modalidades_mes, meses[mes_analise])
         st.plotly_chart(fig_comparativo, use_container_width=True)
 
 
-def render_courses_by_modality_analysis(parceiro_nome: str,
-                                        ano_analise: Optional[int],
-                                        mes_analise: Optional[int],
+def render_courses_by_modality_analysis(pacote: Dict[str, Any],
                                         modalidade_selecionada: str,
                                         periodo_texto: str) -> None:
     """
@@ -88,8 +71,7 @@ def render_courses_by_modality_analysis(parceiro_nome: str,
             "Para análise 'Cursos por Modalidade', selecione uma modalidade específica.")
         return
 
-    cursos_modalidade = get_cursos_parceiro_filtrados(
-        parceiro_nome, ano_analise, mes_analise, modalidade_selecionada)
+    cursos_modalidade = pacote['cursos']
 
     if cursos_modalidade:
         fig_cursos_modalidade = create_cursos_modalidade_chart(
@@ -116,19 +98,15 @@ def render_courses_by_modality_analysis(parceiro_nome: str,
             f"Nenhum curso encontrado para a modalidade '{modalidade_selecionada}' no período selecionado.")
 
 
-def _render_specific_modality_analysis(parceiro_nome: str,
-                                       ano_analise: Optional[int],
-                                       mes_analise: Optional[int],
+def _render_specific_modality_analysis(pacote: Dict[str, Any],
                                        modalidade_selecionada: str,
-                                       periodo_texto: str,
-                                       stats_data: Dict[str, Any]) -> None:
+                                       periodo_texto: str) -> None:
     """
     Renderiza análise para modalidade específica
     """
-    modalidades_periodo = get_modalidades_parceiro_unica(
-        parceiro_nome, ano_analise, mes_analise, modalidade_selecionada)
-    cursos_periodo = get_cursos_parceiro_filtrados(
-        parceiro_nome, ano_analise, mes_analise, modalidade_selecionada)
+    modalidades_periodo = pacote['modalidades']
+    cursos_periodo = pacote['cursos']
+    stats_data = pacote['estatisticas']
 
     col1, col2 = st.columns(2)
 
@@ -169,17 +147,13 @@ def _render_specific_modality_analysis(parceiro_nome: str,
         st.info(f"**📖 Cursos Diferentes:** {stats_data['variedade_cursos']}")
 
 
-def _render_all_modalities_analysis(parceiro_nome: str,
-                                    ano_analise: Optional[int],
-                                    mes_analise: Optional[int],
+def _render_all_modalities_analysis(pacote: Dict[str, Any],
                                     periodo_texto: str) -> None:
     """
     Renderiza análise para todas as modalidades
     """
-    modalidades_periodo = get_modalidades_parceiro_filtradas(
-        parceiro_nome, ano_analise, mes_analise)
-    cursos_periodo = get_cursos_parceiro_filtrados(
-        parceiro_nome, ano_analise, mes_analise)
+    modalidades_periodo = pacote['modalidades']
+    cursos_periodo = pacote['cursos']
 
     col1, col2 = st.columns(2)
 
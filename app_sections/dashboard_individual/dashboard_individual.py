@@ -1,14 +1,10 @@
 # app_sections/dashboard_individual/dashboard_individual.py
 import streamlit as st
-from data.fetch_data import (
-    get_parceiro_vendas_data,
-    get_evolucao_matriculas_parceiro,
-    get_lista_modalidades_parceiro,
-    get_estatisticas_parceiro_filtradas
-)
+from data.fetch_data import get_pacote_parceiro
 from .filters import (
     render_evolution_filters,
     render_analysis_filters,
+    get_filtros_selecionados,
     get_period_text
 )
 from .kpis import (
@@ -40,9 +36,12 @@ def render_dashboard_individual(parceiro_nome: str):
     """
     st.title(f"📊 Dashboard - {parceiro_nome}")
 
-    # Buscar dados do parceiro
+    # Buscar todos os dados do parceiro de uma vez (filtros do rerun atual)
+    filtros = get_filtros_selecionados()
     with st.spinner("Carregando seus dados..."):
-        vendas_data = get_parceiro_vendas_data(parceiro_nome)
+        pacote = get_pacote_parceiro(parceiro_nome, **filtros)
+
+    vendas_data = pacote['vendas'] if pacote else None
 
     if not vendas_data:
         render_error_state()
@@ -60,10 +59,15 @@ def render_dashboard_individual(parceiro_nome: str):
     st.markdown("### 📊 Evolução de Matrículas")
     ano_selecionado, mes_selecionado = render_evolution_filters()
 
-    # Buscar dados de evolução
-    with st.spinner("Carregando evolução de matrículas..."):
-        evolucao_result = get_evolucao_matriculas_parceiro(
-            parceiro_nome, ano_selecionado, mes_selecionado)
+    # Widget ajustou o valor (ex.: primeira renderização): busca de novo
+    if (ano_selecionado, mes_selecionado) != (
+            filtros['ano_evolucao'], filtros['mes_evolucao']):
+        filtros.update(ano_evolucao=ano_selecionado,
+                       mes_evolucao=mes_selecionado)
+        with st.spinner("Carregando evolução de matrículas..."):
+            pacote = get_pacote_parceiro(parceiro_nome, **filtros)
+
+    evolucao_result = pacote['evolucao'] if pacote else None
 
     if evolucao_result and evolucao_result['evolucao_data']:
         meses = {
@@ -87,17 +91,23 @@ def render_dashboard_individual(parceiro_nome: str):
     # Seção de análise avançada
     st.markdown("### 🎯 Análise Avançada de Modalidades e Cursos")
 
-    modalidades_disponiveis = get_lista_modalidades_parceiro(parceiro_nome)
+    modalidades_disponiveis = (
+        pacote['modalidades_disponiveis'] if pacote else [])
     ano_analise, mes_analise, modalidade_selecionada, tipo_analise = render_analysis_filters(
         modalidades_disponiveis)
 
     periodo_texto = get_period_text(
         ano_analise, mes_analise, modalidade_selecionada)
 
-    # Buscar dados da análise
-    with st.spinner("Carregando análise avançada..."):
-        stats_data = get_estatisticas_parceiro_filtradas(
-            parceiro_nome, ano_analise, mes_analise, modalidade_selecionada)
+    if (ano_analise, mes_analise, modalidade_selecionada) != (
+            filtros['ano_analise'], filtros['mes_analise'],
+            filtros['modalidade']):
+        filtros.update(ano_analise=ano_analise, mes_analise=mes_analise,
+                       modalidade=modalidade_selecionada)
+        with st.spinner("Carregando análise avançada..."):
+            pacote = get_pacote_parceiro(parceiro_nome, **filtros)
+
+    stats_data = pacote['estatisticas'] if pacote else None
 
     if stats_data:
         render_analysis_kpis(stats_data, periodo_texto)
@@ -105,16 +115,13 @@ def render_dashboard_individual(parceiro_nome: str):
 
         # Renderizar análise baseada no tipo selecionado
         if tipo_analise == "Visão Geral":
-            render_general_analysis(parceiro_nome, ano_analise,
-                                    mes_analise, modalidade_selecionada,
-                                    periodo_texto, stats_data)
+            render_general_analysis(pacote, modalidade_selecionada,
+                                    periodo_texto)
         elif tipo_analise == "Comparativo 2025 vs Mês" and mes_analise:
             render_comparative_analysis(
-                parceiro_nome, mes_analise, modalidade_selecionada)
+                pacote, mes_analise, modalidade_selecionada)
         elif tipo_analise == "Cursos por Modalidade":
-            render_courses_by_modality_analysis(parceiro_nome,
-                                                ano_analise,
-                                                mes_analise,
+            render_courses_by_modality_analysis(pacote,
                                                 modalidade_selecionada,
                                                 periodo_texto)
 
@@ -1,6 +1,7 @@
 # Detalhes e Informações
 import streamlit as st
 import pandas as pd
+from data.fetch_data import invalidar_cache_planilhas
 from typing import Dict, Any
 
 
@@ -45,5 +46,5 @@ def render_error_state() -> None:
     """
     st.error("❌ Não foi possível carregar seus dados. Tente novamente.")
     if st.button("🔄 Recarregar"):
-        st.cache_data.clear()
+        invalidar_cache_planilhas()
         st.rerun()
@@ -1,7 +1,8 @@
 # Filtros e Controles
 import streamlit as st
 from datetime import datetime
-from typing import Tuple, Optional, List
+from data.fetch_data import invalidar_cache_planilhas
+from typing import Tuple, Optional, List, Dict, Any
 
 
 def render_evolution_filters() -> Tuple[Optional[int], int]:
@@ -17,7 +18,8 @@ def render_evolution_filters() -> Tuple[Optional[int], int]:
             "📅 Selecione o Ano:",
             options=[None] + anos_disponiveis,
             format_func=lambda x: "Todos os anos" if x is None else str(x),
-            index=2
+            index=2,
+            key="ano_evolucao"
         )
 
     with col_filtro2:
@@ -39,12 +41,13 @@ def render_evolution_filters() -> Tuple[Optional[int], int]:
             "📅 Selecione o Mês:",
             options=meses_opcoes,
             format_func=lambda x: meses[x],
-            index=indice_mes_atual
+            index=indice_mes_atual,
+            key="mes_evolucao"
         )
 
     with col_filtro3:
         if st.button("🔄 Atualizar Dados"):
-            st.cache_data.clear()
+            invalidar_cache_planilhas()
             st.rerun()
 
     return ano_selecionado, mes_selecionado
@@ -103,6 +106,22 @@ def render_analysis_filters(modalidades_disponiveis: List[str]) -> Tuple[
     return ano_analise, mes_analise, modalidade_selecionada, tipo_analise
 
 
+def get_filtros_selecionados() -> Dict[str, Any]:
+    """
+    Valores atuais dos filtros (session_state) antes de desenhar os widgets,
+    para buscar os dados do dashboard uma única vez por rerun.
+    Os padrões são os mesmos dos selectboxes.
+    """
+    return {
+        'ano_evolucao': st.session_state.get('ano_evolucao', 2025),
+        'mes_evolucao': st.session_state.get(
+            'mes_evolucao', datetime.now().month),
+        'ano_analise': st.session_state.get('ano_analise', 2025),
+        'mes_analise': st.session_state.get('mes_analise'),
+        'modalidade': st.session_state.get('modalidade_analise', "Todas")
+    }
+
+
 def get_period_text(ano_analise: Optional[int],
                     mes_analise: Optional[int],
                     modalidade_selecionada: str) -> str:
@@ -1,18 +1,46 @@
 # app_sections/dashboard_publico/period_comparison.py
 import streamlit as st
 import pandas as pd
-from data.fetch_data import get_dados_publicos_processados, get_dados_publicos_filtrados
-from utils.graphs import create_modalidades_comparativo_chart
+from typing import Dict, List, Optional, Tuple
+from data.fetch_data import (
+    get_comparativo_periodos,
+    get_meses_disponiveis,
+    periodo_ano,
+    PERIODO_TOTAL
+)
+from utils.graphs import (
+    create_modalidades_comparativo_chart,
+    create_modalidades_periodos_chart
+)
+
+MESES_ABREV = {
+    1: "Jan", 2: "Fev", 3: "Mar", 4: "Abr", 5: "Mai", 6: "Jun",
+    7: "Jul", 8: "Ago", 9: "Set", 10: "Out", 11: "Nov", 12: "Dez"
+}
 
 
 def render_comparativo_periodo() -> None:
     """
     Renderiza comparativo entre diferentes períodos
     """
+    periodos = {
+        'Geral': PERIODO_TOTAL,
+        '2024': periodo_ano(2024),
+        '2025': periodo_ano(2025)
+    }
+
+    periodo_a, periodo_b = _render_period_selectors()
+    if periodo_a and periodo_b:
+        periodos['Período A'] = periodo_a
+        periodos['Período B'] = periodo_b
+
+    # Todos os períodos saem de uma única consulta ao comparativo
     with st.spinner("Carregando dados para comparativo..."):
-        dados_geral = get_dados_publicos_processados()
-        dados_2024 = get_dados_publicos_filtrados(2024)
-        dados_2025 = get_dados_publicos_filtrados(2025)
+        comparativo = get_comparativo_periodos(periodos) or {}
+
+    dados_geral = comparativo.get('Geral')
+    dados_2024 = comparativo.get('2024')
+    dados_2025 = comparativo.get('2025')
 
     # Verificar se temos dados para comparar
     tem_dados = any([
@@ -49,6 +77,166 @@ def render_comparativo_periodo() -> None:
     else:
         st.error("❌ Não foi possível carregar dados para comparativo.")
 
+    if periodo_a and periodo_b:
+        st.markdown("---")
+        _render_period_a_vs_b(comparativo.get('Período A'),
+                              comparativo.get('Período B'),
+                              f"A: {_period_label(periodo_a)}",
+                              f"B: {_period_label(periodo_b)}")
+
+
+def _format_month(mes_ano: Tuple[int, int]) -> str:
+    ano, mes = mes_ano
+    return f"{MESES_ABREV[mes]}/{ano}"
+
+
+def _period_label(periodo: Tuple[Tuple[int, int], Tuple[int, int]]) -> str:
+    inicio, fim = periodo
+    if inicio == fim:
+        return _format_month(inicio)
+    return f"{_format_month(inicio)} a {_format_month(fim)}"
+
+
+def _render_period_selectors() -> Tuple[Optional[tuple], Optional[tuple]]:
+    """
+    Renderiza seletores de intervalo (mês inicial e final) dos períodos A e B
+    Returns: (periodo_a, periodo_b) ou (None, None) sem meses disponíveis
+    """
+    # Opções como ano * 100 + mês: o slider de intervalo espera escalares
+    opcoes = [ano * 100 + mes for ano, mes in get_meses_disponiveis()]
+    if not opcoes:
+        return None, None
+
+    # Padrão: últimos 3 meses (B) contra os mesmos meses do ano anterior (A)
+    inicio_b, fim_b = opcoes[max(len(opcoes) - 3, 0)], opcoes[-1]
+    inicio_a, fim_a = inicio_b - 100, fim_b - 100
+    if inicio_a not in opcoes or fim_a not in opcoes:
+        inicio_a, fim_a = opcoes[0], opcoes[min(2, len(opcoes) - 1)]
+
+    def formatar(chave: int) -> str:
+        return _format_month((chave // 100, chave % 100))
+
+    _descartar_intervalo_invalido("comparativo_periodo_a", opcoes)
+    _descartar_intervalo_invalido("comparativo_periodo_b", opcoes)
+
+    with st.expander("🔀 Comparar Período A vs Período B", expanded=False):
+        col_a, col_b = st.columns(2)
+
+        with col_a:
+            intervalo_a = st.select_slider(
+                "📅 Período A:",
+                options=opcoes,
+                value=(inicio_a, fim_a),
+                format_func=formatar,
+                key="comparativo_periodo_a"
+            )
+
+        with col_b:
+            intervalo_b = st.select_slider(
+                "📅 Período B:",
+                options=opcoes,
+                value=(inicio_b, fim_b),
+                format_func=formatar,
+                key="comparativo_periodo_b"
+            )
+
+    periodo_a = tuple(divmod(chave, 100) for chave in intervalo_a)
+    periodo_b = tuple(divmod(chave, 100) for chave in intervalo_b)
+    return periodo_a, periodo_b
+
+
+def _descartar_intervalo_invalido(chave: str, opcoes: List[int]) -> None:
+    """
+    Uma atualização da base pode tirar meses das opções do slider: o
+    intervalo guardado na sessão com um mês que não existe mais é
+    descartado antes de renderizar e o slider volta ao padrão
+    """
+    intervalo = st.session_state.get(chave)
+    if intervalo is not None and not set(intervalo) <= set(opcoes):
+        del st.session_state[chave]
+
+
+def _render_period_a_vs_b(dados_a: Optional[dict], dados_b: Optional[dict],
+                          rotulo_a: str, rotulo_b: str) -> None:
+    """
+    Renderiza comparativo entre dois intervalos escolhidos
+    """
+    st.markdown(f"### 🔀 {rotulo_a} vs {rotulo_b}")
+
+    if not dados_a and not dados_b:
+        st.info("Nenhum dado encontrado nos períodos selecionados.")
+        return
+
+    modalidades_a = dados_a.get('modalidades', {}) if dados_a else {}
+    modalidades_b = dados_b.get('modalidades', {}) if dados_b else {}
+
+    col_a, col_b, col_delta = st.columns(3)
+    total_a = dados_a['total_matriculas'] if dados_a else 0
+    total_b = dados_b['total_matriculas'] if dados_b else 0
+
+    with col_a:
+        st.metric(f"🎓 Matrículas ({rotulo_a})", total_a)
+    with col_b:
+        st.metric(f"🎓 Matrículas ({rotulo_b})", total_b)
+    with col_delta:
+        variacao = ((total_b - total_a) / total_a * 100) if total_a > 0 else 0
+        st.metric("📈 Variação", total_b - total_a,
+                  delta=f"{variacao:+.1f}%" if total_a > 0 else None)
+
+    fig_periodos = create_modalidades_periodos_chart({
+        rotulo_a: modalidades_a,
+        rotulo_b: modalidades_b
+    })
+    st.plotly_chart(fig_periodos, use_container_width=True)
+
+    _render_share_delta_table(modalidades_a, modalidades_b,
+                              rotulo_a, rotulo_b)
+
+    st.markdown("#### 🏆 Top Cursos")
+    col_cursos_a, col_cursos_b = st.columns(2)
+    for coluna, rotulo, dados in ((col_cursos_a, rotulo_a, dados_a),
+                                  (col_cursos_b, rotulo_b, dados_b)):
+        with coluna:
+            st.markdown(f"**{rotulo}**")
+            cursos = dados.get('cursos', {}) if dados else {}
+            if cursos:
+                st.dataframe(
+                    pd.DataFrame(list(cursos.items()),
+                                 columns=['Curso', 'Matrículas']),
+                    use_container_width=True, hide_index=True)
+            else:
+                st.info("Sem cursos no período.")
+
+
+def _render_share_delta_table(modalidades_a: Dict[str, float],
+                              modalidades_b: Dict[str, float],
+                              rotulo_a: str, rotulo_b: str) -> None:
+    """
+    Renderiza participação de cada modalidade nos dois períodos
+    """
+    todas_modalidades = set(modalidades_a) | set(modalidades_b)
+    if not todas_modalidades:
+        return
+
+    total_a = sum(modalidades_a.values())
+    total_b = sum(modalidades_b.values())
+
+    dados_comparativo = []
+    for modalidade in sorted(todas_modalidades):
+        perc_a = (modalidades_a.get(modalidade, 0) /
+                  total_a * 100) if total_a > 0 else 0
+        perc_b = (modalidades_b.get(modalidade, 0) /
+                  total_b * 100) if total_b > 0 else 0
+        dados_comparativo.append({
+            'Modalidade': modalidade,
+            f'{rotulo_a} (%)': f"{perc_a:.1f}%",
+            f'{rotulo_b} (%)': f"{perc_b:.1f}%",
+            'Variação (p.p.)': f"{perc_b - perc_a:+.1f}"
+        })
+
+    st.dataframe(pd.DataFrame(dados_comparativo),
+                 use_container_width=True, hide_index=True)
+
 
 def _render_comparative_table(modalidades_geral: dict,
                               modalidades_2024: dict,
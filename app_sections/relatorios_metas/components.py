@@ -3,7 +3,13 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime
 from typing import List, Dict, Any
-from utils.report_generator import ReportGenerator
+from utils.report_jobs import (
+    TarefaRelatorio,
+    MIME_FORMATOS,
+    chave_relatorio,
+    solicitar_relatorio,
+    consultar_relatorio
+)
 
 
 def render_report_filters(modalidades_disponiveis: List[str]) -> tuple:
@@ -104,84 +110,96 @@ def render_preview_table(df_preview: pd.DataFrame,
     else:
         st.markdown("##### 📊 Resumo por Modalidade:")
         resumo = df_preview.groupby(
-            'Nível')['Qtd. Matrículas'].sum().reset_index()
+            'Nível', observed=True)['Qtd. Matrículas'].sum().reset_index()
         resumo = resumo.sort_values('Qtd. Matrículas', ascending=False)
         resumo.columns = ['Modalidade', 'Total de Matrículas']
         st.dataframe(resumo, use_container_width=True, hide_index=True)
 
 
+@st.fragment(run_every=1)
+def _acompanhar_tarefa(tarefa: TarefaRelatorio) -> None:
+    """Atualiza o progresso até a tarefa terminar e então recarrega a página"""
+    if not tarefa.em_andamento:
+        st.rerun()
+
+    texto = "Na fila..." if tarefa.status == 'na fila' else (
+        f"Gerando... {tarefa.progresso:.0%}")
+    st.progress(tarefa.progresso, text=texto)
+
+
+def render_report_job(parceiro_nome: str, tipo_relatorio: str, formato: str,
+                      ano_param, mes_param, modalidades_param,
+                      rotulo_botao: str, rotulo_download: str,
+                      prefixo_arquivo: str, key: str,
+                      key_download: str) -> None:
+    """
+    Botão que pede o relatório à fila em segundo plano e, quando pronto,
+    o botão de download. Relatórios já gerados para os mesmos filtros e
+    versão dos dados (em qualquer sessão) aparecem prontos na hora.
+    """
+    chave = chave_relatorio(parceiro_nome, tipo_relatorio, formato,
+                            ano_param, mes_param, modalidades_param)
+
+    if st.button(rotulo_botao, key=key, use_container_width=True,
+                 disabled=chave is None):
+        solicitar_relatorio(chave)
+
+    tarefa = consultar_relatorio(chave) if chave else None
+
+    if tarefa is None:
+        return
+
+    if tarefa.em_andamento:
+        _acompanhar_tarefa(tarefa)
+
+    elif tarefa.status == 'concluído':
+        extensao = {'excel': 'xlsx', 'csv': 'csv', 'pdf': 'pdf'}[formato]
+        filename = f"{prefixo_arquivo}_{datetime.now().strftime('%Y%m%d_%H%M')}.{extensao}"
+        st.download_button(
+            label=rotulo_download,
+            data=tarefa.dados,
+            file_name=filename,
+            mime=MIME_FORMATOS[formato],
+            key=key_download
+        )
+        st.success("✅ Relatório gerado com sucesso!")
+
+    else:
+        st.warning(tarefa.mensagem)
+
+
 def render_download_buttons(parceiro_nome: str, tipo_relatorio: str, ano_param, mes_param, modalidades_param) -> None:
     """
-    Renderiza botões de download
+    Renderiza botões de download (geração em segundo plano)
     """
     st.markdown("#### 📥 Gerar e Baixar Relatório")
 
     col1, col2, col3 = st.columns(3)
-    report_generator = ReportGenerator()
+    prefixo = f"relatorio_{parceiro_nome}_{tipo_relatorio.lower().replace(' ', '_')}"
 
     with col1:
         st.markdown("##### 📊 Excel")
-        if st.button("📊 Gerar Excel", key="excel_btn", use_container_width=True):
-            with st.spinner("Gerando relatório Excel..."):
-                if tipo_relatorio == "Resumo de Vendas":
-                    excel_data = report_generator.generate_summary_report_excel(
-                        parceiro_nome, ano_param, mes_param, modalidades_param
-                    )
-                else:
-                    excel_data = report_generator.generate_detailed_report_excel(
-                        parceiro_nome, ano_param, mes_param, modalidades_param
-                    )
-
-                if excel_data:
-                    filename = f"relatorio_{parceiro_nome}_{tipo_relatorio.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-                    st.download_button(
-                        label="⬇️ Baixar Excel",
-                        data=excel_data,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_excel"
-                    )
-                    st.success("✅ Relatório Excel gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, tipo_relatorio, 'excel',
+            ano_param, mes_param, modalidades_param,
+            "📊 Gerar Excel", "⬇️ Baixar Excel", prefixo,
+            key="excel_btn", key_download="download_excel")
 
     with col2:
         st.markdown("##### 📄 CSV")
-        if st.button("📄 Gerar CSV", key="csv_btn", use_container_width=True):
-            with st.spinner("Gerando relatório CSV..."):
-                csv_data = report_generator.generate_csv_report(
-                    parceiro_nome, ano_param, mes_param, modalidades_param,
-                    detailed=(tipo_relatorio == "Dados Detalhados")
-                )
-
-                if csv_data:
-                    filename = f"relatorio_{parceiro_nome}_{tipo_relatorio.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-                    st.download_button(
-                        label="⬇️ Baixar CSV",
-                        data=csv_data,
-                        file_name=filename,
-                        mime="text/csv",
-                        key="download_csv"
-                    )
-                    st.success("✅ Relatório CSV gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, tipo_relatorio, 'csv',
+            ano_param, mes_param, modalidades_param,
+            "📄 Gerar CSV", "⬇️ Baixar CSV", prefixo,
+            key="csv_btn", key_download="download_csv")
 
     with col3:
         st.markdown("##### 📑 PDF")
-        if st.button("📑 Gerar PDF", key="pdf_btn", use_container_width=True):
-            with st.spinner("Gerando relatório PDF..."):
-                pdf_data = report_generator.generate_pdf_report(
-                    parceiro_nome, ano_param, mes_param, modalidades_param,
-                    detailed=(tipo_relatorio == "Dados Detalhados")
-                )
-
-                if pdf_data:
-                    filename = f"relatorio_{parceiro_nome}_{tipo_relatorio.lower().replace(' ', '_')}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-                    st.download_button(
-                        label="⬇️ Baixar PDF",
-                        data=pdf_data,
-                        file_name=filename,
-                        mime="application/pdf",
-                        key="download_pdf"
-                    )
-                    st.success("✅ Relatório PDF gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, tipo_relatorio, 'pdf',
+            ano_param, mes_param, modalidades_param,
+            "📑 Gerar PDF", "⬇️ Baixar PDF", prefixo,
+            key="pdf_btn", key_download="download_pdf")
 
 
 def render_report_info() -> None:
@@ -1,9 +1,8 @@
 # app_sections/relatorios_metas/inadimplentes.py
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 from typing import List
-from utils.report_generator import ReportGenerator
+from .components import render_report_job
 
 
 def render_inadimplentes_section(parceiro_nome: str,
@@ -210,7 +209,7 @@ def _render_modality_analysis(df_inadimplentes: pd.DataFrame) -> None:
     st.markdown("#### 📊 Análise por Modalidade")
 
     modalidades_inadimplentes_count = df_inadimplentes.groupby(
-        'Nível')['Qtd. Matrículas'].sum().reset_index()
+        'Nível', observed=True)['Qtd. Matrículas'].sum().reset_index()
     modalidades_inadimplentes_count = modalidades_inadimplentes_count.sort_values(
         'Qtd. Matrículas', ascending=False)
     modalidades_inadimplentes_count.columns = ['Modalidade', 'Inadimplentes']
@@ -282,71 +281,34 @@ def _render_inadimplentes_downloads(parceiro_nome: str,
     st.markdown("#### 📥 Gerar Relatório de Inadimplentes")
 
     col1, col2, col3 = st.columns(3)
-    report_generator = ReportGenerator()
+    prefixo = f"inadimplentes_{parceiro_nome}"
 
     with col1:
         st.markdown("##### 📊 Excel")
-        if st.button("📊 Gerar Excel Inadimplentes",
-                     key="excel_inadimplentes",
-                     use_container_width=True):
-            with st.spinner("Gerando relatório de inadimplentes Excel..."):
-                excel_data = report_generator.generate_inadimplentes_excel(
-                    parceiro_nome, ano_param, mes_param, modalidades_param
-                )
-
-                if excel_data:
-                    filename = f"inadimplentes_{parceiro_nome}_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
-                    st.download_button(
-                        label="⬇️ Baixar Excel Inadimplentes",
-                        data=excel_data,
-                        file_name=filename,
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        key="download_excel_inadimplentes"
-                    )
-                    st.success(
-                        "✅ Relatório de inadimplentes Excel gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, 'Inadimplentes', 'excel',
+            ano_param, mes_param, modalidades_param,
+            "📊 Gerar Excel Inadimplentes", "⬇️ Baixar Excel Inadimplentes",
+            prefixo, key="excel_inadimplentes",
+            key_download="download_excel_inadimplentes")
 
     with col2:
         st.markdown("##### 📄 CSV")
-        if st.button("📄 Gerar CSV Inadimplentes", key="csv_inadimplentes", use_container_width=True):
-            with st.spinner("Gerando relatório de inadimplentes CSV..."):
-                csv_data = report_generator.generate_inadimplentes_csv(
-                    parceiro_nome, ano_param, mes_param, modalidades_param
-                )
-
-                if csv_data:
-                    filename = f"inadimplentes_{parceiro_nome}_{datetime.now().strftime('%Y%m%d_%H%M')}.csv"
-                    st.download_button(
-                        label="⬇️ Baixar CSV Inadimplentes",
-                        data=csv_data,
-                        file_name=filename,
-                        mime="text/csv",
-                        key="download_csv_inadimplentes"
-                    )
-                    st.success(
-                        "✅ Relatório de inadimplentes CSV gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, 'Inadimplentes', 'csv',
+            ano_param, mes_param, modalidades_param,
+            "📄 Gerar CSV Inadimplentes", "⬇️ Baixar CSV Inadimplentes",
+            prefixo, key="csv_inadimplentes",
+            key_download="download_csv_inadimplentes")
 
     with col3:
         st.markdown("##### 📑 PDF")
-        if st.button("📑 Gerar PDF Inadimplentes",
-                     key="pdf_inadimplentes",
-                     use_container_width=True):
-            with st.spinner("Gerando relatório de inadimplentes PDF..."):
-                pdf_data = report_generator.generate_inadimplentes_pdf(
-                    parceiro_nome, ano_param, mes_param, modalidades_param
-                )
-
-                if pdf_data:
-                    filename = f"inadimplentes_{parceiro_nome}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
-                    st.download_button(
-                        label="⬇️ Baixar PDF Inadimplentes",
-                        data=pdf_data,
-                        file_name=filename,
-                        mime="application/pdf",
-                        key="download_pdf_inadimplentes"
-                    )
-                    st.success(
-                        "✅ Relatório de inadimplentes PDF gerado com sucesso!")
+        render_report_job(
+            parceiro_nome, 'Inadimplentes', 'pdf',
+            ano_param, mes_param, modalidades_param,
+            "📑 Gerar PDF Inadimplentes", "⬇️ Baixar PDF Inadimplentes",
+            prefixo, key="pdf_inadimplentes",
+            key_download="download_pdf_inadimplentes")
 
 
 def _render_inadimplentes_info() -> None:
@@ -1,7 +1,7 @@
 # app_sections/relatorios_metas/projections.py
 import streamlit as st
 from typing import Dict, Any
-from utils.projections import SalesProjector
+from utils.projections import SalesProjector, MODELO_AUTOMATICO
 from utils.charts_projections import (
     create_sales_projection_chart,
     create_cumulative_projection_chart,
@@ -20,7 +20,12 @@ def render_projections_section(vendas_data: Dict[str, Any],
 
     # Calcular projeções
     projecoes, targets = _calculate_projections(
-        vendas_data, meses_projecao, model_type, growth_factor_percent)
+        vendas_data, meses_projecao, model_type, growth_factor_percent,
+        parceiro_nome)
+
+    if model_type == MODELO_AUTOMATICO and projecoes.get('modelo_utilizado'):
+        st.caption(
+            f"🧠 Modelo utilizado: {projecoes['modelo_utilizado']}")
 
     # KPIs de projeção
     _render_projection_kpis(projecoes, targets, meses_projecao)
@@ -51,10 +56,12 @@ def _render_projection_controls() -> tuple:
     with col2:
         model_type = st.selectbox(
             "🧠 Modelo de Projeção:",
-            options=["Média de Variação",
+            options=[MODELO_AUTOMATICO, "Média de Variação",
                      "Regressão Linear", "Média Móvel", "ARIMA"],
             index=0,
-            help="Escolha o algoritmo para calcular as projeções."
+            help="Escolha o algoritmo para calcular as projeções. "
+                 "Automático usa o modelo de menor erro no histórico "
+                 "do parceiro."
         )
 
     with col3:
@@ -86,7 +93,8 @@ def _render_projection_controls() -> tuple:
 def _calculate_projections(vendas_data: Dict[str, Any],
                            meses_projecao: int,
                            model_type: str,
-                           growth_factor_percent: float) -> tuple:
+                           growth_factor_percent: float,
+                           parceiro_nome: str = None) -> tuple:
     """
     Calcula projeções e targets
     """
@@ -97,7 +105,8 @@ def _calculate_projections(vendas_data: Dict[str, Any],
             vendas_data['vendas_mensais'],
             meses_projecao,
             model_type=model_type,
-            growth_factor=growth_factor_percent
+            growth_factor=growth_factor_percent,
+            parceiro=parceiro_nome
         )
 
         targets = projector.calculate_targets(
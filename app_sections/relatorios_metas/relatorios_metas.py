@@ -3,11 +3,11 @@ import streamlit as st
 from typing import List
 from data.fetch_data import get_parceiro_vendas_data, get_lista_modalidades_parceiro
 from .projections import render_projections_section
-from .reports import render_reports_section
+from .reports import render_reports_section, render_public_base_export
 from .inadimplentes import render_inadimplentes_section
 
 
-def render_relatorios_metas(parceiro_nome: str):
+def render_relatorios_metas(parceiro_nome: str, admin: bool = False):
     """Renderiza a página de Relatórios e Metas"""
 
     st.markdown(f"""
@@ -27,12 +27,14 @@ def render_relatorios_metas(parceiro_nome: str):
         st.error("❌ Não foi possível carregar os dados. Tente novamente.")
         return
 
-    # Criar tabs
-    tab1, tab2, tab3 = st.tabs([
-        "📊 Projeções e Metas",
-        "📄 Geração de Relatórios",
-        "⚠️ Relatório de Inadimplentes"
-    ])
+    # Criar tabs (administradores também exportam a base completa)
+    abas = ["📊 Projeções e Metas",
+            "📄 Geração de Relatórios",
+            "⚠️ Relatório de Inadimplentes"]
+    if admin:
+        abas.append("🗂️ Base Completa")
+
+    tab1, tab2, tab3, *tab_admin = st.tabs(abas)
 
     with tab1:
         render_projections_section(vendas_data, parceiro_nome)
@@ -42,3 +44,7 @@ def render_relatorios_metas(parceiro_nome: str):
 
     with tab3:
         render_inadimplentes_section(parceiro_nome, modalidades_disponiveis)
+
+    if tab_admin:
+        with tab_admin[0]:
+            render_public_base_export()
@@ -1,7 +1,10 @@
 # app_sections/relatorios_metas/reports.py
 import streamlit as st
+from datetime import datetime
 from typing import List
 from utils.report_generator import ReportGenerator
+from utils.report_jobs import MIME_FORMATOS
+from utils.xlsx_stream import ler_arquivo
 from .components import (
     render_report_filters,
     render_preview_metrics,
@@ -51,3 +54,34 @@ def render_reports_section(parceiro_nome: str,
 
     else:
         render_no_data_suggestions()
+
+
+def render_public_base_export() -> None:
+    """Renderiza a exportação da base de vendas completa (administradores)"""
+
+    st.markdown("### 🗂️ Base de Vendas Completa")
+    st.caption("Exporta as vendas de todos os parceiros em Excel, no formato "
+               "do relatório detalhado.")
+
+    if not st.button("📊 Gerar Excel da base completa",
+                     key="export_base_btn", use_container_width=True):
+        return
+
+    with st.spinner("Exportando base de vendas..."):
+        arquivo = ReportGenerator().export_public_base_excel()
+
+    if arquivo is None:
+        return
+
+    # O arquivo é montado em disco (constant_memory + arquivo temporário);
+    # o download_button só aceita bytes, então ele é lido uma única vez aqui
+    filename = f"base_vendas_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+    st.download_button(
+        label="⬇️ Baixar Excel",
+        data=ler_arquivo(arquivo),
+        file_name=filename,
+        mime=MIME_FORMATOS['excel'],
+        key="download_base_completa",
+        on_click="ignore"
+    )
+    st.success("✅ Base exportada com sucesso!")
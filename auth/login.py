@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from config import ADMIN_IDS
 from data.fetch_data import fetch_parceiros_data
 from typing import Optional, Dict, Any
 
@@ -35,6 +36,7 @@ class AuthManager:
                             'RESPONSÁVEL'],
                         'id': user_info[
                             'ID'],
+                        'admin': str(user_info['ID']) in ADMIN_IDS,
                         'authenticated': True
                     }
 
@@ -101,6 +103,13 @@ class AuthManager:
             return st.session_state[self.session_key]
         return None
 
+    def is_admin(self) -> bool:
+        """
+        Verifica se o usuário atual tem acesso de administrador
+        """
+        user = self.get_current_user()
+        return bool(user and user.get('admin', False))
+
     def logout(self):
         """
         Realiza o logout do usuário
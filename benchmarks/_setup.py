@@ -0,0 +1,14 @@
+# Preparação comum dos benchmarks: importar antes dos módulos do projeto
+import os
+import sys
+import pandas as pd
+
+# config.py exige as variáveis do Google Sheets na importação
+for _planilha in ('POLOS', 'VENDAS', 'ALUNOS'):
+    os.environ.setdefault(f'GOOGLE_SHEETS_{_planilha}_API_KEY', 'benchmark')
+    os.environ.setdefault(f'GOOGLE_SHEETS_{_planilha}_SHEET_ID', 'benchmark')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Mesmo modo de pandas do app (Copy-on-Write), para medir o mesmo código
+pd.set_option('mode.copy_on_write', True)
@@ -0,0 +1,91 @@
+# Pico de memória do relatório detalhado: ExcelWriter em BytesIO x fluxo
+# Uso: python benchmarks/bench_export_excel.py [--linhas 20000 100000]
+import argparse
+import io
+import random
+import time
+import tracemalloc
+
+import _setup  # noqa: F401
+import pandas as pd
+from data.ingest import preparar_vendas
+from utils.report_generator import ReportGenerator
+from utils.xlsx_stream import novo_arquivo, ler_arquivo
+
+NIVEIS = ['Graduação', 'Pós-Graduação', 'Segunda Graduação', 'Tecnólogo']
+COLUNAS_EXPORT = ['Parceiro', 'Aluno', 'Nível', 'Curso', 'IES', 'Dt Pagto',
+                  'Qtd. Matrículas', 'Valor Pagto']
+
+
+def gerar_vendas(linhas, seed=42):
+    """Base canônica com a cardinalidade típica da planilha"""
+    rnd = random.Random(seed)
+    bruto = pd.DataFrame({
+        'Parceiro': [f'Parceiro {rnd.randrange(300)}' for _ in range(linhas)],
+        'Aluno': [f'Aluno {i}' for i in range(linhas)],
+        'Nível': [rnd.choice(NIVEIS) for _ in range(linhas)],
+        'Curso': [f'Curso {rnd.randrange(400)}' for _ in range(linhas)],
+        'IES': [f'IES {rnd.randrange(8)}' for _ in range(linhas)],
+        'Dt Pagto': [f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/'
+                     f'{rnd.choice([2024, 2025])}' for _ in range(linhas)],
+        'Qtd. Matrículas': [rnd.choice(['1', '1', '2']) for _ in range(linhas)],
+        'Valor Pagto': [f'R$ {rnd.randrange(100, 2000)},00'
+                        for _ in range(linhas)]
+    })
+    return preparar_vendas(bruto)
+
+
+def exportar_excelwriter(gerador, df_vendas):
+    """Implementação anterior: base formatada inteira + BytesIO"""
+    output = io.BytesIO()
+    df_export = df_vendas[COLUNAS_EXPORT].copy()
+    df_export['Dt Pagto'] = df_export['Dt Pagto'].dt.strftime('%d/%m/%Y')
+    df_export = df_export.sort_values('Dt Pagto')
+    df_export['Valor Pagto'] = df_export['Valor Pagto'].apply(
+        gerador.format_currency_value)
+
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df_export.to_excel(writer, sheet_name='Dados Detalhados', index=False)
+
+    return output.getvalue()
+
+
+def exportar_fluxo(gerador, df_vendas):
+    arquivo = novo_arquivo()
+    gerador.write_detailed_report_excel(df_vendas, arquivo)
+    return ler_arquivo(arquivo)
+
+
+def medir(funcao, *args):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico / 1024 ** 2, len(resultado) / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Pico de memória do relatório detalhado: "
+                     "ExcelWriter em BytesIO x fluxo"))
+    parser.add_argument('--linhas', type=int, nargs='+',
+                        default=[20_000, 100_000])
+    args = parser.parse_args()
+
+    gerador = ReportGenerator()
+    print(f"{'linhas':>8} {'método':>12} {'tempo (s)':>10} {'pico (MB)':>10} "
+          f"{'xlsx (MB)':>10}")
+
+    for quantidade in args.linhas:
+        df_vendas = gerar_vendas(quantidade)
+        for nome, funcao in (('ExcelWriter', exportar_excelwriter),
+                             ('fluxo', exportar_fluxo)):
+            tempo, pico, tamanho = medir(funcao, gerador, df_vendas)
+            print(f"{quantidade:>8} {nome:>12} {tempo:>10.2f} {pico:>10.1f} "
+                  f"{tamanho:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
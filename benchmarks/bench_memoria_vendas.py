@@ -0,0 +1,82 @@
+# Memória por linha da base de vendas: aba bruta (texto) x base canônica
+# Uso: python benchmarks/bench_memoria_vendas.py [--linhas 10000 200000]
+import argparse
+import pickle
+import random
+import time
+
+import _setup  # noqa: F401
+from data.sheets_api import _rows_to_dataframe
+from data.ingest import preparar_vendas, relatorio_memoria
+
+CABECALHO = ['Parceiro', 'Aluno', 'Nível', 'Curso', 'IES', 'Dt Pagto',
+             'Qtd. Matrículas', 'Valor Pagto', 'Valor Taxa Matrícula',
+             'Primeira Mensalidade Dt. Pagto',
+             'Primeira Mensalidade Valor. Pagto']
+
+NIVEIS = ['Graduação', 'Pós-Graduação', 'Segunda Graduação', 'Tecnólogo']
+NAO_PAGOU = 'Não pagou a primeira mensalidade.'
+
+
+def gerar_linhas(quantidade, seed=42):
+    """Linhas com a cardinalidade típica da planilha de vendas"""
+    rnd = random.Random(seed)
+    cursos = [f'Curso {i}' for i in range(400)] + [
+        f'Combo {i}: Curso {i}, Curso {i + 1}' for i in range(50)]
+    valores = [f'R$ {v},00' for v in range(100, 2000, 50)]
+
+    linhas = []
+    for i in range(quantidade):
+        pagou = rnd.random() < 0.9
+        linhas.append([
+            f'Parceiro {rnd.randrange(300)}',
+            f'Aluno {i}',
+            rnd.choice(NIVEIS),
+            rnd.choice(cursos),
+            f'IES {rnd.randrange(8)}',
+            f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/'
+            f'{rnd.choice([2024, 2025])}',
+            rnd.choice(['1', '1', '1', '2']),
+            rnd.choice(valores),
+            rnd.choice(['R$ 50,00', 'R$ 99,90', '']),
+            f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2025'
+            if pagou else NAO_PAGOU,
+            rnd.choice(valores) if pagou else NAO_PAGOU
+        ])
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Memória por linha da base de vendas: "
+                     "aba bruta (texto) x base canônica"))
+    parser.add_argument('--linhas', type=int, nargs='+',
+                        default=[10_000, 200_000])
+    args = parser.parse_args()
+
+    for quantidade in args.linhas:
+        bruto = _rows_to_dataframe(gerar_linhas(quantidade), CABECALHO)
+        canonico = preparar_vendas(bruto)
+        relatorio = relatorio_memoria(bruto, canonico)
+
+        print(f"\n{quantidade} linhas")
+        print(f"{'coluna':>35} {'antes':>8} {'depois':>8}  tipo")
+        for coluna, (antes, depois, tipo) in relatorio['colunas'].items():
+            nome = coluna.replace('\n', ' ')
+            print(f"{nome:>35} {antes:>8.1f} {depois:>8.1f}  {tipo}")
+        print(f"{'total (bytes/linha)':>35} {relatorio['antes']:>8.1f} "
+              f"{relatorio['depois']:>8.1f}  "
+              f"(-{relatorio['reducao']:.0%})")
+
+        # st.cache_data serializa o resultado com pickle a cada acesso
+        for nome, df in (('bruto', bruto), ('canônico', canonico)):
+            inicio = time.perf_counter()
+            serializado = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.loads(serializado)
+            tempo = time.perf_counter() - inicio
+            print(f"{'pickle ' + nome:>35} {len(serializado) / 1024 ** 2:>8.1f}"
+                  f" MB {tempo:>6.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# Projeções da rede inteira: calculate_projections por parceiro x lote NumPy
+# Uso: python benchmarks/bench_projecoes_lote.py [--parceiros 100 500 2000]
+import argparse
+import time
+
+import _setup  # noqa: F401
+import numpy as np
+import pandas as pd
+from data.partner_data import MESES_VENDAS
+from utils.projections import SalesProjector
+
+MODELOS = ["Média de Variação", "Média Móvel", "Regressão Linear"]
+
+
+def gerar_matriz(parceiros, seed=42):
+    """Vendas mensais com ~30% de meses sem venda"""
+    rng = np.random.default_rng(seed)
+    valores = rng.integers(1, 80, size=(parceiros, 12)).astype(float)
+    valores[rng.random((parceiros, 12)) < 0.3] = 0
+    return pd.DataFrame(valores, columns=MESES_VENDAS,
+                        index=[f'Parceiro {i}' for i in range(parceiros)])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Projeções da rede inteira: calculate_projections "
+                     "por parceiro x lote NumPy"))
+    parser.add_argument('--parceiros', type=int, nargs='+',
+                        default=[100, 500, 2000])
+    args = parser.parse_args()
+
+    projector = SalesProjector()
+    print(f"{'parceiros':>10} {'modelo':>18} {'laço (s)':>10} {'lote (ms)':>10}")
+
+    for parceiros in args.parceiros:
+        matriz = gerar_matriz(parceiros)
+        dicionarios = [linha.to_dict() for _, linha in matriz.iterrows()]
+
+        for modelo in MODELOS:
+            inicio = time.perf_counter()
+            for vendas_mensais in dicionarios:
+                projector.calculate_projections(vendas_mensais, 6, modelo)
+            laco = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            projector.calculate_batch_projections(matriz, 6, modelo)
+            lote = time.perf_counter() - inicio
+
+            print(f"{parceiros:>10} {modelo:>18} {laco:>10.3f} "
+                  f"{lote * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
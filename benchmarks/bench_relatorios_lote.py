@@ -0,0 +1,62 @@
+# Tempo do lote de relatórios (todos os parceiros) por número de processos
+# Uso: python benchmarks/bench_relatorios_lote.py [--parceiros 60] [--processos 1 2 4]
+import argparse
+import io
+import os
+import random
+import time
+
+import _setup  # noqa: F401
+import pandas as pd
+from data.ingest import preparar_vendas
+from utils.bulk_reports import gerar_relatorios_lote
+
+NIVEIS = ['Graduação', 'Pós-Graduação', 'Segunda Graduação', 'Tecnólogo']
+
+
+def gerar_vendas(parceiros, linhas_por_parceiro, seed=42):
+    """Base canônica com vendas de todos os meses para cada parceiro"""
+    rnd = random.Random(seed)
+    linhas = parceiros * linhas_por_parceiro
+    bruto = pd.DataFrame({
+        'Parceiro': [f'Parceiro {i % parceiros}' for i in range(linhas)],
+        'Aluno': [f'Aluno {i}' for i in range(linhas)],
+        'Nível': [rnd.choice(NIVEIS) for _ in range(linhas)],
+        'Curso': [f'Curso {rnd.randrange(400)}' for _ in range(linhas)],
+        'IES': [f'IES {rnd.randrange(8)}' for _ in range(linhas)],
+        'Dt Pagto': [f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2025'
+                     for _ in range(linhas)],
+        'Qtd. Matrículas': [rnd.choice(['1', '1', '2']) for _ in range(linhas)],
+        'Valor Pagto': [f'R$ {rnd.randrange(100, 2000)},00'
+                        for _ in range(linhas)]
+    })
+    return preparar_vendas(bruto)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Tempo do lote de relatórios (todos os parceiros) "
+                     "por número de processos"))
+    parser.add_argument('--parceiros', type=int, default=60)
+    parser.add_argument('--linhas-por-parceiro', type=int, default=2000)
+    parser.add_argument('--processos', type=int, nargs='+',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    df_vendas = gerar_vendas(args.parceiros, args.linhas_por_parceiro)
+    print(f"{args.parceiros} parceiros, {len(df_vendas)} linhas, "
+          f"{os.cpu_count()} núcleos")
+    print(f"{'processos':>10} {'tempo (s)':>10} {'zip (MB)':>9}")
+
+    for processos in args.processos:
+        destino = io.BytesIO()
+        inicio = time.perf_counter()
+        gerar_relatorios_lote(destino, 2025, None, 'Dados Detalhados',
+                              processos=processos, df_vendas=df_vendas)
+        tempo = time.perf_counter() - inicio
+        print(f"{processos:>10} {tempo:>10.2f} "
+              f"{len(destino.getvalue()) / 1024 ** 2:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
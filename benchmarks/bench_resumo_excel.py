@@ -0,0 +1,87 @@
+# Abas do relatório resumido: laço com máscara por grupo x um groupby
+# Uso: python benchmarks/bench_resumo_excel.py [--linhas 20000] [--cursos 30 300 1000]
+import argparse
+import random
+import time
+
+import _setup  # noqa: F401
+import pandas as pd
+from data.currency import formatar_centavos
+from data.ingest import preparar_vendas
+from utils.report_generator import ReportGenerator
+
+NIVEIS = ['Graduação', 'Pós-Graduação', 'Segunda Graduação', 'Tecnólogo']
+
+
+def gerar_vendas(linhas, cursos, seed=42):
+    """Vendas de um parceiro com a quantidade de cursos pedida"""
+    rnd = random.Random(seed)
+    bruto = pd.DataFrame({
+        'Parceiro': 'Parceiro',
+        'Nível': [rnd.choice(NIVEIS) for _ in range(linhas)],
+        'Curso': [f'Curso {rnd.randrange(cursos)}' for _ in range(linhas)],
+        'IES': [f'IES {rnd.randrange(8)}' for _ in range(linhas)],
+        'Dt Pagto': [f'{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/2025'
+                     for _ in range(linhas)],
+        'Qtd. Matrículas': [rnd.choice(['1', '1', '2']) for _ in range(linhas)],
+        'Valor Pagto': [f'R$ {rnd.randrange(100, 2000)},{rnd.randrange(100):02d}'
+                        for _ in range(linhas)]
+    })
+    return preparar_vendas(bruto)
+
+
+def resumo_laco(gerador, df_vendas, coluna):
+    """Implementação anterior: uma máscara e uma soma por grupo"""
+    contagem = df_vendas.groupby(coluna, observed=True).agg({
+        'Qtd. Matrículas': 'sum'
+    }).reset_index().sort_values('Qtd. Matrículas', ascending=False)
+
+    valores = []
+    for valor in contagem[coluna]:
+        df_grupo = df_vendas[df_vendas[coluna] == valor]
+        valores.append(gerador.format_currency_value(
+            gerador.calculate_total_value(df_grupo)))
+    contagem['Valor Total'] = valores
+    return contagem
+
+
+def resumo_groupby(gerador, df_vendas, coluna):
+    resumo = gerador.summarize_by(
+        df_vendas, coluna, gerador.get_value_cents(df_vendas))
+    resumo['valor'] = resumo['valor'].map(formatar_centavos)
+    return resumo
+
+
+def medir(funcao, *args, repeticoes=3):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Abas do relatório resumido: laço com máscara por "
+                     "grupo x um groupby"))
+    parser.add_argument('--linhas', type=int, default=20_000)
+    parser.add_argument('--cursos', type=int, nargs='+',
+                        default=[30, 300, 1000])
+    args = parser.parse_args()
+
+    gerador = ReportGenerator()
+    print(f"{'cursos':>8} {'laço (s)':>10} {'groupby (s)':>12} "
+          f"{'planilha (s)':>13}")
+
+    for cursos in args.cursos:
+        df_vendas = gerar_vendas(args.linhas, cursos)
+        laco = medir(resumo_laco, gerador, df_vendas, 'Curso')
+        agrupado = medir(resumo_groupby, gerador, df_vendas, 'Curso')
+        planilha = medir(gerador.build_summary_report_excel,
+                         df_vendas, 2025, None)
+        print(f"{cursos:>8} {laco:>10.3f} {agrupado:>12.4f} {planilha:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
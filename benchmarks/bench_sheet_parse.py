@@ -0,0 +1,84 @@
+# Micro-benchmark da montagem do DataFrame a partir do JSON do Sheets
+# Uso: python benchmarks/bench_sheet_parse.py [--linhas 10000 100000 1000000]
+import argparse
+import random
+import time
+import tracemalloc
+
+import _setup  # noqa: F401
+import pandas as pd
+from data.sheets_api import _rows_to_dataframe
+
+CABECALHO = ['Parceiro', 'Aluno', 'Nível', 'Curso', 'IES', 'Dt Pagto',
+             'Qtd. Matrículas', 'Valor Pagto', 'Valor Taxa Matrícula',
+             'Primeira Mensalidade Dt. Pagto']
+
+
+def _rows_to_dataframe_loop(rows, headers):
+    """Implementação anterior (laço Python), mantida para comparação"""
+    max_cols = len(headers)
+    normalized_rows = []
+    for row in rows:
+        if len(row) < max_cols:
+            row.extend([''] * (max_cols - len(row)))
+        elif len(row) > max_cols:
+            row = row[:max_cols]
+        normalized_rows.append(row)
+    df = pd.DataFrame(normalized_rows, columns=headers)
+    return df.dropna(how='all')
+
+
+def gerar_linhas(quantidade, seed=42):
+    """Linhas no formato da API: irregulares, algumas longas e vazias"""
+    rnd = random.Random(seed)
+    linhas = []
+    for i in range(quantidade):
+        linha = [f'Parceiro {i % 300}', f'Aluno {i}', 'Graduação',
+                 'Pedagogia', 'IES', f'{i % 28 + 1:02d}/03/2025', '1',
+                 'R$ 1.234,56', 'R$ 50,00', '01/04/2025']
+        sorteio = rnd.random()
+        if sorteio < 0.3:
+            linha = linha[:rnd.randint(1, len(linha) - 1)]
+        elif sorteio < 0.35:
+            linha = linha + ['extra']
+        elif sorteio < 0.37:
+            linha = []
+        linhas.append(linha)
+    return linhas
+
+
+def medir(funcao, linhas):
+    # Cópia das listas: a versão antiga altera as linhas no lugar
+    entrada = [list(linha) for linha in linhas]
+    inicio = time.perf_counter()
+    funcao(entrada, CABECALHO)
+    tempo = time.perf_counter() - inicio
+
+    entrada = [list(linha) for linha in linhas]
+    tracemalloc.start()
+    funcao(entrada, CABECALHO)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return tempo, pico / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=("Micro-benchmark da montagem do DataFrame a partir "
+                     "do JSON do Sheets"))
+    parser.add_argument('--linhas', type=int, nargs='+',
+                        default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'linhas':>10} {'versão':>10} {'tempo (s)':>10} {'pico (MB)':>10}")
+    for quantidade in args.linhas:
+        linhas = gerar_linhas(quantidade)
+        for nome, funcao in (('laço', _rows_to_dataframe_loop),
+                             ('vetorial', _rows_to_dataframe)):
+            tempo, pico = medir(funcao, linhas)
+            print(f"{quantidade:>10} {nome:>10} {tempo:>10.3f} {pico:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
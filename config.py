@@ -27,6 +27,16 @@ def get_env_var(name: str) -> str:
     return value
 
 
+def get_optional_env_var(name: str, default: str = '') -> str:
+    """
+    Como get_env_var, mas retorna o padrão se a variável não existir
+    """
+    try:
+        return get_env_var(name)
+    except ValueError:
+        return default
+
+
 # Configurações das APIs e planilhas
 GOOGLE_SHEETS_CONFIG = {
     'planilha_polos': {
@@ -43,7 +53,9 @@ GOOGLE_SHEETS_CONFIG = {
         'abas': {
             'base_vendas': 'Base de Vendas',
             'dados_parceiros': 'Relação de Parceiros'
-        }
+        },
+        # Abas que só crescem: atualizadas buscando apenas as linhas novas
+        'abas_incrementais': ['base_vendas']
     },
     'planilha_alunos': {
         'API_KEY': get_env_var('GOOGLE_SHEETS_ALUNOS_API_KEY'),
@@ -53,3 +65,11 @@ GOOGLE_SHEETS_CONFIG = {
         }
     }
 }
+
+# IDs de acesso com permissão de administrador (separados por vírgula),
+# ex.: exportar a base de vendas completa
+ADMIN_IDS = {
+    admin_id.strip()
+    for admin_id in get_optional_env_var('UNIDASH_ADMIN_IDS').split(',')
+    if admin_id.strip()
+}
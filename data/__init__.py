@@ -2,10 +2,17 @@
 from .fetch_data import *
 
 __all__ = [
-    'fetch_google_sheet_data',
+    'fetch_planilha_data',
+    'fetch_planilha_versionada',
+    'invalidar_cache_planilhas',
     'fetch_parceiros_data',
     'fetch_vendas_publicas',
+    'get_vendas_canonicas',
+    'get_vendas_parceiro',
+    'get_cursos_explodidos',
+    'get_cubos_vendas',
     'get_parceiro_vendas_data',
+    'get_matriz_vendas_mensais',
     'get_parceiro_vendas_detalhadas',
     'get_evolucao_matriculas_parceiro',
     'get_modalidades_parceiro_filtradas',
@@ -16,9 +23,14 @@ __all__ = [
     'get_cursos_parceiro',
     'get_estatisticas_parceiro_filtradas',
     'get_modalidades_parceiro_unica',
+    'get_pacote_parceiro',
     'get_dados_publicos_processados',
     'get_dados_publicos_filtrados',
     'get_evolucao_modalidades_mensal',
+    'get_comparativo_periodos',
+    'get_meses_disponiveis',
+    'periodo_ano',
+    'PERIODO_TOTAL',
     'get_inadimplentes_parceiro',
     'get_inadimplentes_filtrados'
 ]
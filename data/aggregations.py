@@ -0,0 +1,106 @@
+# Agregações de matrículas por modalidade e curso
+# data/aggregations.py
+import pandas as pd
+from typing import Dict, List, Optional
+
+COLUNA_QTD = 'Qtd. Matrículas'
+
+
+def _ordenar(contagem: pd.Series, limite: Optional[int]) -> Dict[str, float]:
+    """
+    Ordena do maior para o menor mantendo a ordem de aparição nos empates
+    (mesmo resultado de sorted(..., reverse=True) sobre o dict acumulado)
+    """
+    contagem = contagem.sort_values(ascending=False, kind='stable')
+    if limite is not None:
+        contagem = contagem.iloc[:limite]
+    return contagem.to_dict()
+
+
+def _chaves(df: pd.DataFrame, coluna: str, normalizar: bool) -> pd.Series:
+    if coluna not in df.columns:
+        return pd.Series('Não informado', index=df.index)
+    if normalizar:
+        return df[coluna].str.strip()
+    return df[coluna]
+
+
+def contar_matriculas(df: pd.DataFrame, coluna: str,
+                      limite: Optional[int] = None,
+                      normalizar: bool = False,
+                      ordenar: bool = True) -> Dict[str, float]:
+    """
+    Soma 'Qtd. Matrículas' por valor da coluna (ex.: 'Nível').
+    - normalizar: remove espaços nas pontas antes de agrupar
+    - ordenar: do maior para o menor; senão, ordem de aparição
+    """
+    if df.empty:
+        return {}
+
+    contagem = df[COLUNA_QTD].groupby(
+        _chaves(df, coluna, normalizar),
+        observed=True, sort=False, dropna=False).sum()
+
+    if not ordenar:
+        return contagem.to_dict()
+
+    return _ordenar(contagem, limite)
+
+
+def explodir_cursos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabela longa (row_id, curso_individual, qtd) com um registro por curso.
+    Regra de combo: 'Combo X: A, B' vira A e B; partes vazias são
+    descartadas e todos os nomes ficam sem espaços nas pontas.
+    """
+    cursos = df['Curso'].astype(object).str.strip()
+    combo = (cursos.str.lower().str.contains('combo', regex=False, na=False) &
+             cursos.str.contains(',', regex=False, na=False))
+
+    longa = pd.DataFrame({
+        'curso_individual': cursos.where(~combo, cursos.str.split(',')),
+        'combo': combo,
+        'qtd': df[COLUNA_QTD]
+    }).explode('curso_individual')
+
+    # Em cada parte do combo vale o trecho após o primeiro ':'
+    partes = longa['curso_individual'].where(longa['combo'])
+    partes = partes.str.replace(
+        r'(?s)^[^:]*:([^:]*).*$', r'\1', regex=True).str.strip()
+    longa['curso_individual'] = partes.where(
+        longa['combo'], longa['curso_individual'])
+
+    longa = longa[~(longa['combo'] & (longa['curso_individual'] == ''))]
+
+    return pd.DataFrame({
+        'curso_individual': longa['curso_individual'].astype('category'),
+        'qtd': longa['qtd']
+    }).rename_axis('row_id')
+
+
+def contar_matriculas_cursos(df: pd.DataFrame,
+                             limite: Optional[int] = 10,
+                             explosao: Optional[pd.DataFrame] = None
+                             ) -> Dict[str, float]:
+    """
+    Soma 'Qtd. Matrículas' por curso, contando cada curso de um combo.
+    - explosao: tabela de explodir_cursos() da base inteira (as linhas de
+      df são localizadas pelo índice); sem ela, explode apenas df
+    """
+    if df.empty:
+        return {}
+
+    if explosao is None:
+        longa = explodir_cursos(df)
+    else:
+        longa = explosao[explosao.index.isin(df.index)]
+
+    contagem = longa.groupby(
+        'curso_individual', observed=True, sort=False)['qtd'].sum()
+
+    return _ordenar(contagem, limite)
+
+
+def item_mais_vendido(contagem: Dict[str, float], padrao: str) -> tuple:
+    """Primeiro (chave, total) de uma contagem ordenada, ou (padrao, 0)"""
+    return next(iter(contagem.items()), (padrao, 0))
@@ -0,0 +1,166 @@
+# Cubo pré-agregado da base de vendas
+# data/cube.py
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Dict, Optional
+from .sheets_api import fetch_planilha_versionada
+from .snapshot_cache import compartilhar
+from .ingest import vendas_canonicas_da_versao, cursos_explodidos_da_versao
+
+# Dimensões do cubo, na ordem do MultiIndex
+DIMENSOES = ['Parceiro', 'Ano', 'Mes', 'Nível', 'Curso']
+
+# Valores de Nível/Curso descartados nas visões públicas
+VALORES_INVALIDOS = ['-', 'n/a', 'null', 'none', '']
+
+
+def construir_cubo(df_vendas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Soma a base canônica em Parceiro x Ano x Mes x Nível x Curso:
+    - matriculas: soma de 'Qtd. Matrículas'
+    - vendas: quantidade de linhas
+    - ordem: primeira linha do grupo (desempate na ordem de aparição)
+    """
+    base = df_vendas[DIMENSOES].assign(
+        matriculas=df_vendas['Qtd. Matrículas'].to_numpy(),
+        vendas=1,
+        ordem=np.arange(len(df_vendas)))
+
+    return base.groupby(
+        DIMENSOES, observed=True, sort=True, dropna=False).agg(
+            matriculas=('matriculas', 'sum'),
+            vendas=('vendas', 'sum'),
+            ordem=('ordem', 'min'))
+
+
+def construir_cubo_cursos(df_vendas: pd.DataFrame,
+                          explosao: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cubo dos cursos individuais (combos separados): as dimensões do cubo
+    principal mais 'curso_individual', com matriculas e ordem
+    """
+    base = df_vendas.loc[explosao.index, DIMENSOES].assign(
+        curso_individual=explosao['curso_individual'].to_numpy(),
+        matriculas=explosao['qtd'].to_numpy(),
+        ordem=np.arange(len(explosao)))
+
+    return base.groupby(
+        DIMENSOES + ['curso_individual'],
+        observed=True, sort=True, dropna=False).agg(
+            matriculas=('matriculas', 'sum'),
+            ordem=('ordem', 'min'))
+
+
+def fatiar_cubo(cubo: pd.DataFrame, parceiro: str = None, ano: int = None,
+                mes: int = None, modalidade: str = None) -> pd.DataFrame:
+    """
+    Seleciona o trecho do cubo pelos filtros informados (vazios = todos)
+    """
+    if modalidade == "Todas":
+        modalidade = None
+
+    # Listas (e não escalares) mantêm todos os níveis do índice na fatia
+    chave = tuple([valor] if valor else slice(None)
+                  for valor in (parceiro, ano, mes, modalidade))
+
+    try:
+        return cubo.iloc[cubo.index.get_locs(chave)]
+    except KeyError:
+        return cubo.iloc[0:0]
+
+
+def filtrar_validos(fatia: pd.DataFrame,
+                    exigir_data: bool = True) -> pd.DataFrame:
+    """
+    Remove datas inválidas e Nível/Curso vazios ou inválidos (visão pública)
+    - exigir_data: False mantém as linhas sem data válida (visão geral)
+    """
+    mascara = np.ones(len(fatia), dtype=bool)
+    if exigir_data:
+        mascara &= fatia.index.get_level_values('Ano') > 0
+
+    for dimensao in ('Nível', 'Curso'):
+        valores = pd.Series(
+            fatia.index.get_level_values(dimensao).astype(object))
+        mascara &= (valores.notna() & ~valores.str.lower().str.strip().isin(
+            VALORES_INVALIDOS)).to_numpy()
+
+    return fatia[mascara]
+
+
+def somar_cubo(fatia: pd.DataFrame, dimensao: str,
+               limite: Optional[int] = None,
+               normalizar: bool = False) -> Dict[str, float]:
+    """
+    Soma as matrículas da fatia por uma dimensão, do maior para o menor,
+    com empates na ordem de aparição na base
+    """
+    if fatia.empty:
+        return {}
+
+    chaves = fatia.index.get_level_values(dimensao).astype(object)
+    if normalizar:
+        chaves = chaves.str.strip()
+
+    # Agregação direta em NumPy: a fatia é pequena e o custo fixo de um
+    # groupby do pandas dominaria o tempo da consulta
+    codigos, unicos = pd.factorize(chaves, use_na_sentinel=False)
+    matriculas = fatia['matriculas'].to_numpy()
+    totais = np.bincount(codigos, weights=matriculas, minlength=len(unicos))
+    if np.issubdtype(matriculas.dtype, np.integer):
+        totais = totais.astype(np.int64)
+    ordem = np.full(len(unicos), np.iinfo(np.int64).max)
+    np.minimum.at(ordem, codigos, fatia['ordem'].to_numpy())
+
+    posicoes = np.lexsort((ordem, -totais))[:limite]
+
+    return {unicos[i]: totais[i].item() for i in posicoes}
+
+
+def contar_distintos(fatia: pd.DataFrame, dimensao: str) -> int:
+    """Quantidade de valores distintos de uma dimensão na fatia"""
+    return fatia.index.get_level_values(dimensao).nunique()
+
+
+@st.cache_resource(max_entries=2)
+def _cubos(versao: str, _df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Monta os cubos uma vez por versão (compartilhados: não alterar)
+    """
+    df = vendas_canonicas_da_versao(versao, _df_vendas)
+    return {
+        'vendas': construir_cubo(df),
+        'cursos': construir_cubo_cursos(
+            df, cursos_explodidos_da_versao(versao, _df_vendas))
+    }
+
+
+def cubos_da_versao(versao: str,
+                    df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Cubos de uma versão do snapshot, para os caches derivados de outros
+    módulos (compartilhados entre sessões: não alterar)
+    """
+    return _cubos(versao, df_vendas)
+
+
+def get_cubos_vendas() -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Retorna {'vendas': cubo principal, 'cursos': cubo de cursos individuais}
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+        df_vendas = dados.get('base_vendas')
+
+        if versao is None or df_vendas is None or df_vendas.empty:
+            return None
+
+        return {
+            nome: compartilhar(cubo)
+            for nome, cubo in _cubos(versao, df_vendas).items()
+        }
+
+    except Exception as e:
+        st.error(f"Erro ao montar cubo de vendas: {str(e)}")
+        return None
@@ -0,0 +1,64 @@
+# Valores monetários em reais (texto da planilha -> centavos)
+# data/currency.py
+import numpy as np
+import pandas as pd
+from typing import Tuple
+
+# Coluna de texto -> coluna int64 em centavos criada na ingestão
+COLUNAS_MONETARIAS = {
+    'Valor Pagto': 'valor_centavos',
+    'Valor Taxa Matrícula': 'taxa_matricula_centavos'
+}
+
+
+def _converter_textos(textos: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """Converte textos distintos (sem nulos) em (centavos, falhou)"""
+    limpo = textos.astype(str).str.strip()
+    vazio = limpo == ''
+
+    # 'R$ 1.234,56' / '200(2)' (vale o número antes do parêntese) / '99.90'
+    limpo = limpo.str.replace('R$', '', regex=False).str.replace(
+        ' ', '', regex=False).str.split('(', n=1).str[0]
+
+    tem_virgula = limpo.str.contains(',', regex=False)
+    tem_ponto = limpo.str.contains('.', regex=False)
+
+    # Com vírgula e ponto vale o formato brasileiro (1.234,56);
+    # só com vírgula ela é o separador decimal
+    limpo = limpo.mask(tem_virgula & tem_ponto,
+                       limpo.str.replace('.', '', regex=False))
+    limpo = limpo.str.replace(',', '.', regex=False)
+
+    numeros = pd.to_numeric(limpo, errors='coerce').to_numpy(dtype=float)
+    validos = np.isfinite(numeros)
+
+    centavos = np.zeros(len(numeros), dtype=np.int64)
+    centavos[validos] = np.round(numeros[validos] * 100).astype(np.int64)
+
+    return centavos, ~validos & ~vazio.to_numpy()
+
+
+def brl_para_centavos(serie: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Converte uma coluna de valores em texto para centavos (int64).
+    Vazios contam como 0; textos não reconhecidos (ex.: 'abc') também
+    valem 0 e são marcados na segunda série (falhas) para contabilização.
+    Cada valor distinto é convertido uma única vez.
+    """
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+
+    centavos_unicos, falhas_unicas = _converter_textos(
+        pd.Series(unicos, dtype=object))
+
+    # Nulos (código -1) entram como vazios
+    centavos_unicos = np.append(centavos_unicos, 0)
+    falhas_unicas = np.append(falhas_unicas, False)
+
+    return (pd.Series(centavos_unicos[codigos], index=serie.index),
+            pd.Series(falhas_unicas[codigos], index=serie.index))
+
+
+def formatar_centavos(centavos: int) -> str:
+    """Formata centavos como moeda brasileira (ex.: 'R$ 1.234,56')"""
+    return f"R$ {centavos / 100:,.2f}".replace(
+        ',', 'X').replace('.', ',').replace('X', '.')
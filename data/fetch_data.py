@@ -5,14 +5,29 @@ Módulo principal de fetch de dados - Importa todas as funções dos submódulos
 
 # Importar funções da API do Google Sheets
 from .sheets_api import (
-    fetch_google_sheet_data,
+    fetch_planilha_data,
+    fetch_planilha_versionada,
+    invalidar_cache_planilhas,
     fetch_parceiros_data,
     fetch_vendas_publicas
 )
 
+# Importar base de vendas tipada
+from .ingest import (
+    get_vendas_canonicas,
+    get_vendas_parceiro,
+    get_cursos_explodidos
+)
+
+# Importar cubo pré-agregado
+from .cube import (
+    get_cubos_vendas
+)
+
 # Importar funções de dados de parceiros
 from .partner_data import (
     get_parceiro_vendas_data,
+    get_matriz_vendas_mensais,
     get_parceiro_vendas_detalhadas,
     get_modalidades_parceiro_filtradas,
     get_cursos_parceiro_filtrados,
@@ -33,6 +48,11 @@ from .statistics_data import (
     get_estatisticas_parceiro_filtradas
 )
 
+# Importar pacote do dashboard individual
+from .partner_bundle import (
+    get_pacote_parceiro
+)
+
 # Importar funções de dados públicos
 from .public_data import (
     get_dados_publicos_processados,
@@ -40,6 +60,14 @@ from .public_data import (
     get_evolucao_modalidades_mensal
 )
 
+# Importar comparativo entre períodos
+from .period_comparison import (
+    get_comparativo_periodos,
+    get_meses_disponiveis,
+    periodo_ano,
+    PERIODO_TOTAL
+)
+
 # Importar funções de inadimplentes
 from .inadimplentes_data import (
     get_inadimplentes_parceiro,
@@ -49,12 +77,21 @@ from .inadimplentes_data import (
 # Definir todas as funções disponíveis para importação
 __all__ = [
     # API Google Sheets
-    'fetch_google_sheet_data',
+    'fetch_planilha_data',
+    'fetch_planilha_versionada',
+    'invalidar_cache_planilhas',
     'fetch_parceiros_data',
     'fetch_vendas_publicas',
 
+    # Base de vendas tipada
+    'get_vendas_canonicas',
+    'get_vendas_parceiro',
+    'get_cursos_explodidos',
+    'get_cubos_vendas',
+
     # Dados de parceiros
     'get_parceiro_vendas_data',
+    'get_matriz_vendas_mensais',
     'get_parceiro_vendas_detalhadas',
     'get_modalidades_parceiro_filtradas',
     'get_cursos_parceiro_filtrados',
@@ -70,11 +107,20 @@ __all__ = [
     'get_estatisticas_parceiro',
     'get_estatisticas_parceiro_filtradas',
 
+    # Pacote do dashboard individual
+    'get_pacote_parceiro',
+
     # Dados públicos
     'get_dados_publicos_processados',
     'get_dados_publicos_filtrados',
     'get_evolucao_modalidades_mensal',
 
+    # Comparativo entre períodos
+    'get_comparativo_periodos',
+    'get_meses_disponiveis',
+    'periodo_ano',
+    'PERIODO_TOTAL',
+
     # Inadimplentes
     'get_inadimplentes_parceiro',
     'get_inadimplentes_filtrados'
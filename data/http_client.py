@@ -0,0 +1,109 @@
+# Cliente HTTP compartilhado para as APIs do Google
+import threading
+import time
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_random_exponential
+)
+from typing import Optional, Dict, Any
+
+# Timeouts em segundos: (conexão, leitura)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+
+# Política de novas tentativas
+MAX_TENTATIVAS = 4
+ESPERA_MAXIMA = 20
+STATUS_TRANSITORIOS = {429, 500, 502, 503, 504}
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class RespostaTransitoriaError(Exception):
+    """Resposta HTTP transitória (429/5xx) que pode ser repetida"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Resposta transitória: {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def get_http_session() -> requests.Session:
+    """
+    Retorna a sessão HTTP do processo, com pool de conexões e keep-alive
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # As novas tentativas ficam a cargo do tenacity
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=16, max_retries=0)
+                session.mount('https://', adapter)
+                _session = session
+
+    return _session
+
+
+def _parse_retry_after(valor: Optional[str]) -> Optional[float]:
+    """Interpreta o cabeçalho Retry-After (segundos ou data HTTP)"""
+    if not valor:
+        return None
+
+    try:
+        return max(0.0, float(valor))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+_backoff = wait_random_exponential(multiplier=0.5, max=ESPERA_MAXIMA)
+
+
+def _tempo_de_espera(retry_state) -> float:
+    """Respeita o Retry-After do servidor; senão, backoff exponencial com jitter"""
+    erro = retry_state.outcome.exception()
+
+    if isinstance(erro, RespostaTransitoriaError) and erro.retry_after is not None:
+        return min(erro.retry_after, ESPERA_MAXIMA)
+
+    return _backoff(retry_state)
+
+
+@retry(
+    retry=retry_if_exception_type((
+        requests.ConnectionError,
+        requests.Timeout,
+        RespostaTransitoriaError
+    )),
+    wait=_tempo_de_espera,
+    stop=stop_after_attempt(MAX_TENTATIVAS),
+    reraise=True
+)
+def http_get(url: str,
+             params: Optional[Dict[str, Any]] = None) -> requests.Response:
+    """
+    GET com timeouts explícitos e novas tentativas para falhas transitórias.
+    Respostas não transitórias (ex.: 403) são devolvidas ao chamador.
+    """
+    response = get_http_session().get(
+        url, params=params, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+
+    if response.status_code in STATUS_TRANSITORIOS:
+        raise RespostaTransitoriaError(
+            response.status_code,
+            _parse_retry_after(response.headers.get('Retry-After')))
+
+    return response
@@ -3,7 +3,7 @@
 import pandas as pd
 import streamlit as st
 from typing import Optional, List
-from .sheets_api import fetch_vendas_publicas
+from .ingest import get_vendas_parceiro
 
 
 def get_inadimplentes_parceiro(parceiro_nome: str) -> Optional[pd.DataFrame]:
@@ -11,116 +11,93 @@ def get_inadimplentes_parceiro(parceiro_nome: str) -> Optional[pd.DataFrame]:
     Retorna dados de alunos inadimplentes
     """
     try:
-        df_vendas = fetch_vendas_publicas()
-
-        if df_vendas is not None and not df_vendas.empty:
-            # Filtrar vendas do parceiro específico
-            vendas_parceiro = df_vendas[df_vendas['Parceiro']
-                                        == parceiro_nome].copy()
-
-            if not vendas_parceiro.empty:
-                # Buscar colunas de primeira mensalidade
-                colunas_primeira_mensalidade_dt = [
-                    'Primeira Mensalidade Dt. Pagto',
-                    'Primeira Mensalidade\nDt. Pagto',
-                    'Primeira Mensalidade Dt Pagto',
-                    'Primeira MensalidadeDt. Pagto'
-                ]
-
-                colunas_primeira_mensalidade_valor = [
-                    'Primeira Mensalidade Valor. Pagto',
-                    'Primeira Mensalidade\nValor. Pagto',
-                    'Primeira Mensalidade Valor Pagto',
-                    'Primeira MensalidadeValor. Pagto'
-                ]
-
-                # Encontrar as colunas corretas
-                col_dt_encontrada = None
-                col_valor_encontrada = None
-
-                for col in colunas_primeira_mensalidade_dt:
-                    if col in vendas_parceiro.columns:
+        # Fatia pronta do índice por parceiro
+        vendas_parceiro = get_vendas_parceiro(parceiro_nome)
+
+        if vendas_parceiro is not None and not vendas_parceiro.empty:
+            # Buscar colunas de primeira mensalidade
+            colunas_primeira_mensalidade_dt = [
+                'Primeira Mensalidade Dt. Pagto',
+                'Primeira Mensalidade\nDt. Pagto',
+                'Primeira Mensalidade Dt Pagto',
+                'Primeira MensalidadeDt. Pagto'
+            ]
+
+            colunas_primeira_mensalidade_valor = [
+                'Primeira Mensalidade Valor. Pagto',
+                'Primeira Mensalidade\nValor. Pagto',
+                'Primeira Mensalidade Valor Pagto',
+                'Primeira MensalidadeValor. Pagto'
+            ]
+
+            # Encontrar as colunas corretas
+            col_dt_encontrada = None
+            col_valor_encontrada = None
+
+            for col in colunas_primeira_mensalidade_dt:
+                if col in vendas_parceiro.columns:
+                    col_dt_encontrada = col
+                    break
+
+            for col in colunas_primeira_mensalidade_valor:
+                if col in vendas_parceiro.columns:
+                    col_valor_encontrada = col
+                    break
+
+            # Se não encontrou as colunas, tentar busca por substring
+            if not col_dt_encontrada:
+                for col in vendas_parceiro.columns:
+                    if 'primeira mensalidade' in col.lower() and (
+                            'dt' in col.lower() or 'data' in col.lower()):
                         col_dt_encontrada = col
                         break
 
-                for col in colunas_primeira_mensalidade_valor:
-                    if col in vendas_parceiro.columns:
+            if not col_valor_encontrada:
+                for col in vendas_parceiro.columns:
+                    if 'primeira mensalidade' in col.lower() and 'valor' in col.lower():
                         col_valor_encontrada = col
                         break
 
-                # Se não encontrou as colunas, tentar busca por substring
-                if not col_dt_encontrada:
-                    for col in vendas_parceiro.columns:
-                        if 'primeira mensalidade' in col.lower() and (
-                                'dt' in col.lower() or 'data' in col.lower()):
-                            col_dt_encontrada = col
-                            break
-
-                if not col_valor_encontrada:
-                    for col in vendas_parceiro.columns:
-                        if 'primeira mensalidade' in col.lower() and 'valor' in col.lower():
-                            col_valor_encontrada = col
-                            break
-
-                if col_dt_encontrada and col_valor_encontrada:
-                    # Filtrar apenas alunos que não pagaram a primeira mensalidade
-                    inadimplentes = vendas_parceiro[
-                        (vendas_parceiro[
-                            col_dt_encontrada
-                            ] == 'Não pagou a primeira mensalidade.') |
-                        (vendas_parceiro[col_valor_encontrada]
-                         == 'Não pagou a primeira mensalidade.')
-                    ].copy()
-
-                    if not inadimplentes.empty:
-                        # Processar dados de data de pagamento da matrícula
-                        if 'Dt Pagto' in inadimplentes.columns:
-                            inadimplentes['Dt Pagto'] = pd.to_datetime(
-                                inadimplentes['Dt Pagto'],
-                                format='%d/%m/%Y',
-                                errors='coerce'
-                            )
-
-                        # Processar quantidade de matrículas
-                        if 'Qtd. Matrículas' in inadimplentes.columns:
-                            inadimplentes['Qtd. Matrículas'] = pd.to_numeric(
-                                inadimplentes['Qtd. Matrículas'],
-                                errors='coerce'
-                            ).fillna(1)
-                        else:
-                            inadimplentes['Qtd. Matrículas'] = 1
-
-                        # Padronizar nomes das colunas para facilitar o uso
-                        inadimplentes = inadimplentes.rename(columns={
-                            col_dt_encontrada: 'Primeira Mensalidade Dt. Pagto',
-                            col_valor_encontrada: 'Primeira Mensalidade Valor. Pagto'
-                        })
-
-                        return inadimplentes
-                    else:
-                        st.info(
-                            "Nenhum aluno inadimplente encontrado.")
-                        return pd.DataFrame()
+            if col_dt_encontrada and col_valor_encontrada:
+                # Filtrar apenas alunos que não pagaram a primeira mensalidade
+                inadimplentes = vendas_parceiro[
+                    (vendas_parceiro[
+                        col_dt_encontrada
+                        ] == 'Não pagou a primeira mensalidade.') |
+                    (vendas_parceiro[col_valor_encontrada]
+                     == 'Não pagou a primeira mensalidade.')
+                ].copy()
+
+                if not inadimplentes.empty:
+                    # Padronizar nomes das colunas para facilitar o uso
+                    inadimplentes = inadimplentes.rename(columns={
+                        col_dt_encontrada: 'Primeira Mensalidade Dt. Pagto',
+                        col_valor_encontrada: 'Primeira Mensalidade Valor. Pagto'
+                    })
+
+                    return inadimplentes
                 else:
-                    # Mostrar colunas que contêm "primeira mensalidade"
-                    colunas_relacionadas = [
-                        col for col in vendas_parceiro.columns if 'primeira mensalidade' in col.lower()]
-                    if colunas_relacionadas:
-                        st.warning(
-                            f"Colunas relacionadas à primeira mensalidade encontradas: {colunas_relacionadas}")
-                    else:
-                        st.warning(
-                            "Nenhuma coluna relacionada à primeira mensalidade foi encontrada.")
-
-                    st.warning(
-                        "As colunas de primeira mensalidade não foram encontradas na planilha.")
-                    return None
+                    st.info(
+                        "Nenhum aluno inadimplente encontrado.")
+                    return pd.DataFrame()
             else:
-                st.info(
-                    f"Nenhum dado encontrado para o parceiro: {parceiro_nome}")
-                return None
+                # Mostrar colunas que contêm "primeira mensalidade"
+                colunas_relacionadas = [
+                    col for col in vendas_parceiro.columns if 'primeira mensalidade' in col.lower()]
+                if colunas_relacionadas:
+                    st.warning(
+                        f"Colunas relacionadas à primeira mensalidade encontradas: {colunas_relacionadas}")
+                else:
+                    st.warning(
+                        "Nenhuma coluna relacionada à primeira mensalidade foi encontrada.")
 
-        return None
+                st.warning(
+                    "As colunas de primeira mensalidade não foram encontradas na planilha.")
+                return None
+        else:
+            st.info(
+                f"Nenhum dado encontrado para o parceiro: {parceiro_nome}")
+            return None
 
     except Exception as e:
         st.error(f"Erro ao buscar dados de inadimplentes: {str(e)}")
@@ -145,10 +122,10 @@ def get_inadimplentes_filtrados(
         df_filtrado = df_inadimplentes.copy()
 
         if ano:
-            df_filtrado = df_filtrado[df_filtrado['Dt Pagto'].dt.year == ano]
+            df_filtrado = df_filtrado[df_filtrado['Ano'] == ano]
 
         if mes:
-            df_filtrado = df_filtrado[df_filtrado['Dt Pagto'].dt.month == mes]
+            df_filtrado = df_filtrado[df_filtrado['Mes'] == mes]
 
         # Filtrar apenas modalidades permitidas para inadimplentes
         modalidades_permitidas = ['Graduação',
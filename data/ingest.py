@@ -0,0 +1,237 @@
+# Ingestão da base de vendas
+# data/ingest.py
+import logging
+import numpy as np
+import pandas as pd
+import streamlit as st
+from typing import Any, Dict, Optional
+from .sheets_api import fetch_planilha_versionada
+from .snapshot_cache import compartilhar
+from .aggregations import explodir_cursos
+from .currency import COLUNAS_MONETARIAS, brl_para_centavos
+
+# Colunas de texto com poucos valores distintos
+COLUNAS_CATEGORICAS = ['Parceiro', 'Nível', 'Curso', 'IES']
+
+# Demais colunas de texto (valores, status da primeira mensalidade...)
+# viram categóricas quando têm até esta fração de valores distintos
+LIMITE_CARDINALIDADE = 0.5
+
+logger = logging.getLogger(__name__)
+
+
+def _inteiro_compacto(serie: pd.Series) -> pd.Series:
+    """Menor tipo inteiro que comporta a série (mantém float se houver fração)"""
+    if not (serie % 1 == 0).all():
+        return serie
+    return pd.to_numeric(serie, downcast='integer')
+
+
+def preparar_vendas(df_vendas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte a aba 'Base de Vendas' (tudo texto) no DataFrame canônico:
+    - 'Dt Pagto' como datetime64 (datas inválidas viram NaT)
+    - 'Ano' (int16) e 'Mes' (int8) pré-calculados (0 quando a data é inválida)
+    - 'Qtd. Matrículas' no menor inteiro possível (sem valor assume 1)
+    - valores em centavos (int64) ao lado do texto original, conforme
+      COLUNAS_MONETARIAS; falhas de conversão por coluna em
+      df.attrs['falhas_valores']
+    - Parceiro, Nível, Curso e IES como categóricas, assim como as demais
+      colunas de texto repetitivo (ver LIMITE_CARDINALIDADE)
+    """
+    df = df_vendas.copy()
+
+    if 'Dt Pagto' in df.columns:
+        df['Dt Pagto'] = pd.to_datetime(
+            df['Dt Pagto'], format='%d/%m/%Y', errors='coerce')
+    else:
+        df['Dt Pagto'] = pd.NaT
+
+    df['Ano'] = df['Dt Pagto'].dt.year.fillna(0).astype('int16')
+    df['Mes'] = df['Dt Pagto'].dt.month.fillna(0).astype('int8')
+
+    if 'Qtd. Matrículas' in df.columns:
+        df['Qtd. Matrículas'] = _inteiro_compacto(pd.to_numeric(
+            df['Qtd. Matrículas'], errors='coerce').fillna(1))
+    else:
+        df['Qtd. Matrículas'] = np.int8(1)
+
+    falhas_valores = {}
+    for coluna, coluna_centavos in COLUNAS_MONETARIAS.items():
+        if coluna in df.columns:
+            df[coluna_centavos], falhas = brl_para_centavos(df[coluna])
+            if falhas.any():
+                falhas_valores[coluna] = int(falhas.sum())
+                logger.warning(
+                    "%d valores não reconhecidos em '%s' (ex.: %s)",
+                    falhas_valores[coluna], coluna,
+                    list(df.loc[falhas, coluna].unique()[:3]))
+    df.attrs['falhas_valores'] = falhas_valores
+
+    for coluna in COLUNAS_CATEGORICAS:
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('category')
+
+    # Nomes de colunas repetidos (cabeçalho da planilha) ficam como estão
+    colunas_texto = [
+        coluna for coluna in df.columns[~df.columns.duplicated(keep=False)]
+        if df[coluna].dtype == object]
+    for coluna in colunas_texto:
+        if df[coluna].nunique() <= LIMITE_CARDINALIDADE * len(df):
+            df[coluna] = df[coluna].astype('category')
+
+    return df
+
+
+def bytes_por_linha(df: pd.DataFrame) -> float:
+    """Memória (com o conteúdo das strings) dividida pelo número de linhas"""
+    return float(df.memory_usage(deep=True, index=False).sum()) / max(
+        len(df), 1)
+
+
+def relatorio_memoria(df_bruto: pd.DataFrame,
+                      df_canonico: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Compara bytes por linha da aba bruta (texto) e da base canônica:
+    - antes / depois: totais por linha
+    - colunas: {coluna: (antes, depois, tipo)} por linha
+    - reducao: fração economizada
+    """
+    linhas = max(len(df_bruto), 1)
+    antes = df_bruto.memory_usage(deep=True, index=False) / linhas
+    depois = df_canonico.memory_usage(deep=True, index=False) / max(
+        len(df_canonico), 1)
+
+    colunas = {}
+    for posicao, coluna in enumerate(df_canonico.columns):
+        colunas[coluna] = (
+            float(antes.iloc[posicao]) if posicao < len(antes) else 0.0,
+            float(depois.iloc[posicao]),
+            str(df_canonico.dtypes.iloc[posicao]))
+
+    total_antes = float(antes.sum())
+    total_depois = float(depois.sum())
+
+    return {
+        'antes': total_antes,
+        'depois': total_depois,
+        'colunas': colunas,
+        'reducao': 1 - total_depois / total_antes if total_antes else 0.0
+    }
+
+
+@st.cache_resource(max_entries=2)
+def _vendas_canonicas(versao: str, _df_vendas: pd.DataFrame) -> pd.DataFrame:
+    # Cache por versão do snapshot: o parse roda uma vez por atualização e
+    # o resultado é compartilhado entre as sessões
+    df = preparar_vendas(_df_vendas)
+
+    if logger.isEnabledFor(logging.INFO):
+        relatorio = relatorio_memoria(_df_vendas, df)
+        logger.info(
+            "Base de vendas %s: %.0f -> %.0f bytes/linha (%d linhas)",
+            versao, relatorio['antes'], relatorio['depois'], len(df))
+
+    return df
+
+
+@st.cache_resource(max_entries=2)
+def _indice_parceiros(versao: str,
+                      _df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Particiona a base canônica por parceiro, uma vez por versão.
+    Os DataFrames são compartilhados entre sessões: não alterar no lugar.
+    """
+    df = _vendas_canonicas(versao, _df_vendas)
+    return {
+        str(parceiro): grupo
+        for parceiro, grupo in df.groupby(
+            'Parceiro', observed=True, sort=False)
+    }
+
+
+@st.cache_resource(max_entries=2)
+def _cursos_explodidos(versao: str, _df_vendas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabela longa de cursos individuais (combos separados), uma vez por versão
+    """
+    return explodir_cursos(_vendas_canonicas(versao, _df_vendas))
+
+
+def vendas_canonicas_da_versao(versao: str,
+                              df_vendas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Base canônica de uma versão do snapshot, para os caches derivados de
+    outros módulos (objeto compartilhado entre sessões: não alterar)
+    """
+    return _vendas_canonicas(versao, df_vendas)
+
+
+def indice_parceiros_da_versao(
+        versao: str, df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Vendas de cada parceiro na versão (compartilhadas: não alterar)"""
+    return _indice_parceiros(versao, df_vendas)
+
+
+def cursos_explodidos_da_versao(versao: str,
+                                df_vendas: pd.DataFrame) -> pd.DataFrame:
+    """Cursos individuais da versão (compartilhados: não alterar)"""
+    return _cursos_explodidos(versao, df_vendas)
+
+
+def get_vendas_canonicas() -> Optional[pd.DataFrame]:
+    """
+    Retorna a base de vendas tipada, processada uma única vez por versão
+    (visão sem cópia dos dados compartilhados, protegida por Copy-on-Write)
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+        df_vendas = dados.get('base_vendas')
+
+        if versao is None or df_vendas is None or df_vendas.empty:
+            return None
+
+        return compartilhar(_vendas_canonicas(versao, df_vendas))
+
+    except Exception as e:
+        st.error(f"Erro ao processar base de vendas: {str(e)}")
+        return None
+
+
+def get_vendas_parceiro(parceiro_nome: str) -> Optional[pd.DataFrame]:
+    """
+    Retorna as vendas do parceiro pelo índice (sem varrer nem copiar a base).
+    Os valores são compartilhados; escritas na visão ficam locais (CoW).
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+        df_vendas = dados.get('base_vendas')
+
+        if versao is None or df_vendas is None or df_vendas.empty:
+            return None
+
+        return compartilhar(
+            _indice_parceiros(versao, df_vendas).get(parceiro_nome))
+
+    except Exception as e:
+        st.error(f"Erro ao buscar vendas do parceiro: {str(e)}")
+        return None
+
+
+def get_cursos_explodidos() -> Optional[pd.DataFrame]:
+    """
+    Retorna a tabela (row_id, curso_individual, qtd) da base inteira.
+    row_id é o índice da linha na base canônica.
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+        df_vendas = dados.get('base_vendas')
+
+        if versao is None or df_vendas is None or df_vendas.empty:
+            return None
+
+        return compartilhar(_cursos_explodidos(versao, df_vendas))
+
+    except Exception as e:
+        st.error(f"Erro ao processar cursos da base de vendas: {str(e)}")
+        return None
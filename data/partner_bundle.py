@@ -0,0 +1,111 @@
+# Pacote de dados do dashboard individual
+# data/partner_bundle.py
+import pandas as pd
+import streamlit as st
+from typing import Optional, Dict, Any
+from .sheets_api import fetch_planilha_versionada
+from .snapshot_cache import compartilhar
+from .ingest import indice_parceiros_da_versao
+from .cube import cubos_da_versao
+from .partner_data import (
+    extrair_vendas_parceiro,
+    calcular_modalidades,
+    calcular_cursos,
+    listar_modalidades
+)
+from .evolution_data import calcular_evolucao
+from .statistics_data import calcular_estatisticas_filtradas
+
+# Ano fixo do comparativo "2025 vs Mês"
+ANO_COMPARATIVO = 2025
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def _pacote_parceiro(versao: str, parceiro_nome: str,
+                     ano_evolucao: Optional[int], mes_evolucao: Optional[int],
+                     ano_analise: Optional[int], mes_analise: Optional[int],
+                     modalidade: Optional[str],
+                     _df_parceiros: Optional[pd.DataFrame],
+                     _df_vendas: Optional[pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Calcula o pacote uma vez por (parceiro, filtros, versão dos dados).
+    As abas recebidas são as da própria versão: nada aqui busca a
+    planilha de novo (o cache não mistura dados de versões diferentes).
+    """
+    pacote = {
+        'vendas': None,
+        'evolucao': None,
+        'modalidades_disponiveis': [],
+        'estatisticas': None,
+        'modalidades': None,
+        'cursos': None,
+        'comparativo': None
+    }
+
+    if _df_parceiros is not None:
+        pacote['vendas'] = extrair_vendas_parceiro(_df_parceiros, parceiro_nome)
+
+    if _df_vendas is None or _df_vendas.empty:
+        return pacote
+
+    vendas_parceiro = compartilhar(
+        indice_parceiros_da_versao(versao, _df_vendas).get(parceiro_nome))
+    if vendas_parceiro is not None and not vendas_parceiro.empty:
+        pacote['evolucao'] = calcular_evolucao(
+            vendas_parceiro, ano_evolucao, mes_evolucao)
+
+    cubos = {
+        nome: compartilhar(cubo)
+        for nome, cubo in cubos_da_versao(versao, _df_vendas).items()
+    }
+
+    pacote['modalidades_disponiveis'] = listar_modalidades(
+        cubos, parceiro_nome)
+    pacote['estatisticas'] = calcular_estatisticas_filtradas(
+        cubos, parceiro_nome, ano_analise, mes_analise, modalidade)
+    pacote['modalidades'] = calcular_modalidades(
+        cubos, parceiro_nome, ano_analise, mes_analise, modalidade)
+    pacote['cursos'] = calcular_cursos(
+        cubos, parceiro_nome, ano_analise, mes_analise, modalidade)
+
+    if mes_analise:
+        pacote['comparativo'] = {
+            'ano': calcular_modalidades(
+                cubos, parceiro_nome, ANO_COMPARATIVO, None, modalidade),
+            'mes': calcular_modalidades(
+                cubos, parceiro_nome, ANO_COMPARATIVO, mes_analise, modalidade)
+        }
+
+    return pacote
+
+
+def get_pacote_parceiro(parceiro_nome: str,
+                        ano_evolucao: int = None, mes_evolucao: int = None,
+                        ano_analise: int = None, mes_analise: int = None,
+                        modalidade: str = None) -> Optional[Dict[str, Any]]:
+    """
+    Retorna tudo que o dashboard individual usa em uma única chamada:
+    - vendas: KPIs da aba de parceiros (get_parceiro_vendas_data)
+    - evolucao: evolução diária (get_evolucao_matriculas_parceiro)
+    - modalidades_disponiveis: lista para o filtro de modalidade
+    - estatisticas: indicadores do período (get_estatisticas_parceiro_filtradas)
+    - modalidades / cursos: rankings do período
+    - comparativo: modalidades de 2025 e do mês (quando há mês)
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+
+        if versao is None:
+            return None
+
+        if modalidade == "Todas":
+            modalidade = None
+
+        return _pacote_parceiro(
+            versao, parceiro_nome, ano_evolucao, mes_evolucao,
+            ano_analise, mes_analise, modalidade,
+            dados.get('dados_parceiros'), dados.get('base_vendas'))
+
+    except Exception as e:
+        st.error(f"Erro ao montar dados do parceiro: {str(e)}")
+        return None
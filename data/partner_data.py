@@ -2,7 +2,71 @@
 import pandas as pd
 import streamlit as st
 from typing import Optional, Dict, Any, List
-from .sheets_api import fetch_parceiros_data, fetch_vendas_publicas
+from .sheets_api import fetch_parceiros_data
+from .ingest import get_vendas_parceiro, get_cursos_explodidos
+from .aggregations import contar_matriculas, contar_matriculas_cursos
+from .cube import get_cubos_vendas, fatiar_cubo, somar_cubo
+
+# Colunas mensais da aba 'Relação de Parceiros'
+MESES_VENDAS = ['jan./2025', 'fev./2025', 'mar./2025', 'abr./2025',
+                'mai./2025', 'jun./2025', 'jul./2025', 'ago./2025',
+                'set./2025', 'out./2025', 'nov./2025', 'dez./2025']
+
+COLUNA_PARCEIRO = 'Parceiro - VENDAS PINCEL + GESTOR'
+
+
+def extrair_vendas_parceiro(df_parceiros: pd.DataFrame,
+                            parceiro_nome: str) -> Optional[Dict[str, Any]]:
+    """
+    Monta os dados de vendas do parceiro a partir da aba de parceiros
+    """
+    parceiro_data = df_parceiros[
+        df_parceiros[COLUNA_PARCEIRO] == parceiro_nome
+    ]
+
+    if not parceiro_data.empty:
+        data = parceiro_data.iloc[0]
+
+        # Extrair dados mensais
+        vendas_mensais = {}
+        for mes in MESES_VENDAS:
+            try:
+                valor = pd.to_numeric(
+                    data.get(mes, 0), errors='coerce')
+                vendas_mensais[mes] = valor if pd.notna(valor) else 0
+            except:
+                vendas_mensais[mes] = 0
+
+        return {
+            'parceiro': data[COLUNA_PARCEIRO],
+            'tipo': data['TIPO'],
+            'responsavel': data['RESPONSÁVEL'],
+            'total_2025': pd.to_numeric(data.get(
+                'TOTAL 2025', 0), errors='coerce') or 0,
+            'vendas_2024_2025': pd.to_numeric(data.get(
+                'VENDAS 2024 + 2025', 0), errors='coerce') or 0,
+            'vendas_mensais': vendas_mensais
+        }
+
+    return None
+
+
+def montar_matriz_vendas_mensais(df_parceiros: pd.DataFrame) -> pd.DataFrame:
+    """
+    Matriz parceiros x meses (colunas de MESES_VENDAS) com as vendas da aba
+    de parceiros; valores ausentes ou não numéricos valem 0. Parceiros
+    repetidos ficam com a primeira linha, como em extrair_vendas_parceiro.
+    """
+    base = df_parceiros[df_parceiros[COLUNA_PARCEIRO].notna()]
+    base = base.drop_duplicates(COLUNA_PARCEIRO)
+
+    matriz = pd.DataFrame({
+        mes: pd.to_numeric(base[mes], errors='coerce').to_numpy()
+        if mes in base.columns else 0
+        for mes in MESES_VENDAS
+    }, index=pd.Index(base[COLUNA_PARCEIRO], name='Parceiro'))
+
+    return matriz.fillna(0)
 
 
 def get_parceiro_vendas_data(parceiro_nome: str) -> Optional[Dict[str, Any]]:
@@ -13,38 +77,7 @@ def get_parceiro_vendas_data(parceiro_nome: str) -> Optional[Dict[str, Any]]:
         df_parceiros = fetch_parceiros_data()
 
         if df_parceiros is not None:
-            parceiro_data = df_parceiros[
-                df_parceiros[
-                    'Parceiro - VENDAS PINCEL + GESTOR'] == parceiro_nome
-            ]
-
-            if not parceiro_data.empty:
-                data = parceiro_data.iloc[0]
-
-                # Extrair dados mensais
-                meses = ['jan./2025', 'fev./2025', 'mar./2025', 'abr./2025',
-                         'mai./2025', 'jun./2025', 'jul./2025', 'ago./2025',
-                         'set./2025', 'out./2025', 'nov./2025', 'dez./2025']
-
-                vendas_mensais = {}
-                for mes in meses:
-                    try:
-                        valor = pd.to_numeric(
-                            data.get(mes, 0), errors='coerce')
-                        vendas_mensais[mes] = valor if pd.notna(valor) else 0
-                    except:
-                        vendas_mensais[mes] = 0
-
-                return {
-                    'parceiro': data['Parceiro - VENDAS PINCEL + GESTOR'],
-                    'tipo': data['TIPO'],
-                    'responsavel': data['RESPONSÁVEL'],
-                    'total_2025': pd.to_numeric(data.get(
-                        'TOTAL 2025', 0), errors='coerce') or 0,
-                    'vendas_2024_2025': pd.to_numeric(data.get(
-                        'VENDAS 2024 + 2025', 0), errors='coerce') or 0,
-                    'vendas_mensais': vendas_mensais
-                }
+            return extrair_vendas_parceiro(df_parceiros, parceiro_nome)
 
         return None
 
@@ -53,37 +86,35 @@ def get_parceiro_vendas_data(parceiro_nome: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def get_matriz_vendas_mensais() -> Optional[pd.DataFrame]:
+    """
+    Retorna a matriz parceiros x meses de toda a rede (projeções em lote)
+    """
+    try:
+        df_parceiros = fetch_parceiros_data()
+
+        if df_parceiros is None or df_parceiros.empty:
+            return None
+
+        return montar_matriz_vendas_mensais(df_parceiros)
+
+    except Exception as e:
+        st.error(f"Erro ao montar vendas mensais dos parceiros: {str(e)}")
+        return None
+
+
 def get_parceiro_vendas_detalhadas(
         parceiro_nome: str) -> Optional[pd.DataFrame]:
     """
     Retorna dados detalhados de vendas de um parceiro específico.
+    O DataFrame é compartilhado: filtre ou copie antes de alterar.
     """
     try:
-        df_vendas = fetch_vendas_publicas()
+        # Fatia pronta do índice por parceiro (base já tipada na ingestão)
+        vendas_parceiro = get_vendas_parceiro(parceiro_nome)
 
-        if df_vendas is not None and not df_vendas.empty:
-            # Filtrar vendas do parceiro específico
-            vendas_parceiro = df_vendas[df_vendas['Parceiro']
-                                        == parceiro_nome].copy()
-
-            if not vendas_parceiro.empty:
-                if 'Dt Pagto' in vendas_parceiro.columns:
-                    vendas_parceiro['Dt Pagto'] = pd.to_datetime(
-                        vendas_parceiro['Dt Pagto'],
-                        format='%d/%m/%Y',
-                        errors='coerce'
-                    )
-
-                # Processar quantidade de matrículas
-                if 'Qtd. Matrículas' in vendas_parceiro.columns:
-                    vendas_parceiro['Qtd. Matrículas'] = pd.to_numeric(
-                        vendas_parceiro['Qtd. Matrículas'],
-                        errors='coerce'
-                    ).fillna(1)  # Se não tiver valor, assume 1
-                else:
-                    vendas_parceiro['Qtd. Matrículas'] = 1
-
-                return vendas_parceiro
+        if vendas_parceiro is not None and not vendas_parceiro.empty:
+            return vendas_parceiro
 
         return None
 
@@ -92,42 +123,60 @@ def get_parceiro_vendas_detalhadas(
         return None
 
 
-def get_modalidades_parceiro_filtradas(
-        parceiro_nome: str, ano: int = None,
-        mes: int = None) -> Optional[Dict[str, int]]:
+def calcular_modalidades(cubos: Dict[str, pd.DataFrame], parceiro_nome: str,
+                         ano: int = None, mes: int = None,
+                         modalidade: str = None) -> Optional[Dict[str, int]]:
     """
-    Retorna modalidades mais vendidas do parceiro com filtros de data
+    Top 10 modalidades do parceiro a partir dos cubos; com uma modalidade
+    específica, retorna apenas o total dela
     """
-    try:
-        df_vendas = get_parceiro_vendas_detalhadas(parceiro_nome)
+    fatia = fatiar_cubo(cubos['vendas'], parceiro_nome, ano, mes, modalidade)
 
-        if df_vendas is not None and not df_vendas.empty:
-            df_filtrado = df_vendas.copy()
+    if fatia.empty:
+        return None
+
+    if modalidade and modalidade != "Todas":
+        # Contar apenas a modalidade selecionada
+        return {modalidade: int(fatia['matriculas'].sum())}
 
-            if ano:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.year == ano]
+    # Top 10 modalidades por quantidade de matrículas
+    return somar_cubo(fatia, 'Nível', limite=10)
 
-            if mes:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.month == mes]
 
-            if df_filtrado.empty:
-                return None
+def calcular_cursos(cubos: Dict[str, pd.DataFrame], parceiro_nome: str,
+                    ano: int = None, mes: int = None,
+                    modalidade: str = None) -> Optional[Dict[str, int]]:
+    """
+    Top 10 cursos do parceiro a partir dos cubos (combos contam cada curso)
+    """
+    fatia = fatiar_cubo(cubos['cursos'], parceiro_nome, ano, mes, modalidade)
 
-            modalidades = {}
-            for _, row in df_filtrado.iterrows():
-                nivel = row.get('Nível', 'Não informado')
-                qtd = row.get('Qtd. Matrículas', 1)
-                modalidades[nivel] = modalidades.get(nivel, 0) + qtd
+    if fatia.empty:
+        return None
 
-            # Ordenar por quantidade e pegar top 10
-            modalidades_ordenadas = dict(
-                sorted(modalidades.items(),
-                       key=lambda x: x[1],
-                       reverse=True)[:10])
+    return somar_cubo(fatia, 'curso_individual', limite=10)
 
-            return modalidades_ordenadas
+
+def listar_modalidades(cubos: Dict[str, pd.DataFrame],
+                       parceiro_nome: str) -> List[str]:
+    """
+    Modalidades em que o parceiro tem vendas, em ordem alfabética
+    """
+    fatia = fatiar_cubo(cubos['vendas'], parceiro_nome)
+    return sorted(fatia.index.get_level_values('Nível').dropna().unique())
+
+
+def get_modalidades_parceiro_filtradas(
+        parceiro_nome: str, ano: int = None,
+        mes: int = None) -> Optional[Dict[str, int]]:
+    """
+    Retorna modalidades mais vendidas do parceiro com filtros de data
+    """
+    try:
+        cubos = get_cubos_vendas()
+
+        if cubos is not None:
+            return calcular_modalidades(cubos, parceiro_nome, ano, mes)
 
         return None
 
@@ -143,49 +192,11 @@ def get_cursos_parceiro_filtrados(
     Retorna cursos mais vendidos do parceiro com filtros de data e modalidade
     """
     try:
-        df_vendas = get_parceiro_vendas_detalhadas(parceiro_nome)
-
-        if df_vendas is not None and not df_vendas.empty:
-            # Aplicar filtros
-            df_filtrado = df_vendas.copy()
-
-            if ano:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.year == ano]
+        cubos = get_cubos_vendas()
 
-            if mes:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.month == mes]
-
-            if modalidade and modalidade != "Todas":
-                df_filtrado = df_filtrado[df_filtrado['Nível'] == modalidade]
-
-            if df_filtrado.empty:
-                return None
-
-            # Contar cursos considerando quantidade de matrículas
-            cursos = {}
-            for _, row in df_filtrado.iterrows():
-                curso = row.get('Curso', 'Não informado')
-                qtd = row.get('Qtd. Matrículas', 1)
-
-                # Se for combo, contar cada curso separadamente
-                if 'combo' in curso.lower() and ',' in curso:
-                    cursos_combo = [c.strip() for c in curso.split(',')]
-                    for curso_individual in cursos_combo:
-                        if ':' in curso_individual:
-                            curso_individual = curso_individual.split(':')[
-                                1].strip()
-                        cursos[curso_individual] = cursos.get(
-                            curso_individual, 0) + qtd
-                else:
-                    cursos[curso] = cursos.get(curso, 0) + qtd
-
-            # Ordenar por quantidade e pegar top 10
-            cursos_ordenados = dict(
-                sorted(cursos.items(), key=lambda x: x[1], reverse=True)[:10])
-
-            return cursos_ordenados
+        if cubos is not None:
+            return calcular_cursos(
+                cubos, parceiro_nome, ano, mes, modalidade)
 
         return None
 
@@ -199,11 +210,10 @@ def get_lista_modalidades_parceiro(parceiro_nome: str) -> List[str]:
     Retorna lista de modalidades disponíveis para o parceiro
     """
     try:
-        df_vendas = get_parceiro_vendas_detalhadas(parceiro_nome)
+        cubos = get_cubos_vendas()
 
-        if df_vendas is not None and not df_vendas.empty:
-            modalidades = df_vendas['Nível'].dropna().unique().tolist()
-            return sorted(modalidades)
+        if cubos is not None:
+            return listar_modalidades(cubos, parceiro_nome)
 
         return []
 
@@ -221,17 +231,8 @@ def get_modalidades_parceiro(parceiro_nome: str) -> Optional[Dict[str, int]]:
 
         if df_vendas is not None and not df_vendas.empty:
             # Contar modalidades considerando quantidade de matrículas
-            modalidades = {}
-            for _, row in df_vendas.iterrows():
-                nivel = row.get('Nível', 'Não informado')
-                qtd = row.get('Qtd. Matrículas', 1)
-                modalidades[nivel] = modalidades.get(nivel, 0) + qtd
-
-            # Ordenar por quantidade e pegar top 10
-            modalidades_ordenadas = dict(
-                sorted(modalidades.items(),
-                       key=lambda x: x[1],
-                       reverse=True)[:10])
+            modalidades_ordenadas = contar_matriculas(
+                df_vendas, 'Nível', limite=10)
 
             return modalidades_ordenadas
 
@@ -251,26 +252,8 @@ def get_cursos_parceiro(parceiro_nome: str) -> Optional[Dict[str, int]]:
 
         if df_vendas is not None and not df_vendas.empty:
             # Contar cursos considerando quantidade de matrículas
-            cursos = {}
-            for _, row in df_vendas.iterrows():
-                curso = row.get('Curso', 'Não informado')
-                qtd = row.get('Qtd. Matrículas', 1)
-
-                # Se for combo, contar cada curso separadamente
-                if 'combo' in curso.lower() and ',' in curso:
-                    cursos_combo = [c.strip() for c in curso.split(',')]
-                    for curso_individual in cursos_combo:
-                        if ':' in curso_individual:
-                            curso_individual = curso_individual.split(':')[
-                                1].strip()
-                        cursos[curso_individual] = cursos.get(
-                            curso_individual, 0) + qtd
-                else:
-                    cursos[curso] = cursos.get(curso, 0) + qtd
-
-            # Ordenar por quantidade e pegar top 10
-            cursos_ordenados = dict(
-                sorted(cursos.items(), key=lambda x: x[1], reverse=True)[:10])
+            cursos_ordenados = contar_matriculas_cursos(
+                df_vendas, limite=10, explosao=get_cursos_explodidos())
 
             return cursos_ordenados
 
@@ -288,33 +271,11 @@ def get_modalidades_parceiro_unica(
     Retorna dados da modalidade específica
     """
     try:
-        if not modalidade or modalidade == "Todas":
-            return get_modalidades_parceiro_filtradas(parceiro_nome, ano, mes)
-
-        df_vendas = get_parceiro_vendas_detalhadas(parceiro_nome)
-
-        if df_vendas is not None and not df_vendas.empty:
-            # Aplicar filtros
-            df_filtrado = df_vendas.copy()
-
-            if ano:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.year == ano]
-
-            if mes:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.month == mes]
-
-            # Filtrar pela modalidade específica
-            df_filtrado = df_filtrado[df_filtrado['Nível'] == modalidade]
-
-            if df_filtrado.empty:
-                return None
-
-            # Contar apenas a modalidade selecionada
-            total_matriculas = df_filtrado['Qtd. Matrículas'].sum()
+        cubos = get_cubos_vendas()
 
-            return {modalidade: int(total_matriculas)}
+        if cubos is not None:
+            return calcular_modalidades(
+                cubos, parceiro_nome, ano, mes, modalidade)
 
         return None
 
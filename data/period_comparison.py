@@ -0,0 +1,149 @@
+# Comparativo de modalidades e cursos entre períodos
+# data/period_comparison.py
+import pandas as pd
+import streamlit as st
+from typing import Dict, List, Optional, Tuple, Any
+from .sheets_api import fetch_planilha_versionada
+from .cube import cubos_da_versao, filtrar_validos, somar_cubo
+
+# (ano, mês) inclusivo; None deixa o lado do intervalo aberto
+MesAno = Tuple[int, int]
+Periodo = Tuple[Optional[MesAno], Optional[MesAno]]
+
+# Período sem limites: base inteira, inclusive vendas sem data válida
+PERIODO_TOTAL: Periodo = (None, None)
+
+
+def periodo_ano(ano: int) -> Periodo:
+    """Período de janeiro a dezembro do ano"""
+    return (ano, 1), (ano, 12)
+
+
+def _chave_periodo(mes_ano: MesAno) -> int:
+    ano, mes = mes_ano
+    return ano * 100 + mes
+
+
+def agregar_por_periodo(cubo: pd.DataFrame, dimensao: str,
+                        normalizar: bool = False) -> pd.DataFrame:
+    """
+    Reduz o cubo (linhas válidas) a periodo (ano * 100 + mês) x dimensão,
+    com matriculas, ordem e, se houver, vendas. Vendas sem data válida
+    ficam no periodo 0. Índice ordenado para fatiar intervalos de meses.
+    """
+    validos = filtrar_validos(cubo, exigir_data=False)
+
+    periodo = (validos.index.get_level_values('Ano').astype('int32') * 100 +
+               validos.index.get_level_values('Mes'))
+    chaves = validos.index.get_level_values(dimensao).astype(object)
+    if normalizar:
+        chaves = chaves.str.strip()
+
+    agregacoes = {'matriculas': 'sum', 'ordem': 'min'}
+    if 'vendas' in validos.columns:
+        agregacoes['vendas'] = 'sum'
+
+    return validos[list(agregacoes)].groupby(
+        [pd.Index(periodo, name='periodo'), pd.Index(chaves, name=dimensao)],
+        sort=True).agg(agregacoes)
+
+
+def _fatiar_periodo(grade: pd.DataFrame, periodo: Periodo) -> pd.DataFrame:
+    inicio, fim = periodo
+    if grade.empty or (inicio is None and fim is None):
+        return grade
+
+    # Com qualquer limite informado, só entram vendas com data válida
+    primeiro = _chave_periodo(inicio) if inicio else 1
+    ultimo = _chave_periodo(fim) if fim else grade.index[-1][0]
+    return grade.loc[max(primeiro, 1):ultimo]
+
+
+def comparar_periodos(grades: Dict[str, pd.DataFrame],
+                      periodos: Dict[str, Periodo]
+                      ) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Distribuição de modalidades e top 10 cursos de cada período, no mesmo
+    formato de get_dados_publicos_filtrados (None quando o período é vazio)
+    """
+    resultado = {}
+    for rotulo, periodo in periodos.items():
+        fatia = _fatiar_periodo(grades['vendas'], periodo)
+
+        if fatia.empty:
+            resultado[rotulo] = None
+            continue
+
+        resultado[rotulo] = {
+            'modalidades': somar_cubo(fatia, 'Nível'),
+            'cursos': somar_cubo(
+                _fatiar_periodo(grades['cursos'], periodo),
+                'curso_individual', limite=10),
+            'total_matriculas': int(fatia['matriculas'].sum()),
+            'total_registros': int(fatia['vendas'].sum())
+        }
+
+    return resultado
+
+
+@st.cache_resource(max_entries=2)
+def _grades_periodo(versao: str,
+                    _df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Agrega os cubos por mês uma vez por versão (compartilhados: não alterar)
+    """
+    cubos = cubos_da_versao(versao, _df_vendas)
+    return {
+        'vendas': agregar_por_periodo(cubos['vendas'], 'Nível',
+                                      normalizar=True),
+        'cursos': agregar_por_periodo(cubos['cursos'], 'curso_individual')
+    }
+
+
+def _get_grades() -> Optional[Dict[str, pd.DataFrame]]:
+    versao, dados = fetch_planilha_versionada('planilha_vendas')
+    df_vendas = dados.get('base_vendas')
+
+    if versao is None or df_vendas is None or df_vendas.empty:
+        return None
+
+    return _grades_periodo(versao, df_vendas)
+
+
+def get_comparativo_periodos(
+        periodos: Dict[str, Periodo]
+) -> Optional[Dict[str, Optional[Dict[str, Any]]]]:
+    """
+    Compara quantos períodos forem pedidos, ex.:
+    {'Geral': PERIODO_TOTAL, '2024': periodo_ano(2024),
+     'A': ((2024, 3), (2024, 8)), 'B': ((2025, 3), (2025, 8))}
+    """
+    try:
+        grades = _get_grades()
+
+        if grades is None:
+            return None
+
+        return comparar_periodos(grades, periodos)
+
+    except Exception as e:
+        st.error(f"Erro ao comparar períodos: {str(e)}")
+        return None
+
+
+def get_meses_disponiveis() -> List[MesAno]:
+    """
+    Meses (ano, mês) com vendas válidas, em ordem cronológica
+    """
+    try:
+        grades = _get_grades()
+
+        if grades is None:
+            return []
+
+        periodos = grades['vendas'].index.unique('periodo')
+        return [(int(p) // 100, int(p) % 100) for p in periodos if p > 0]
+
+    except Exception as e:
+        st.error(f"Erro ao listar meses disponíveis: {str(e)}")
+        return []
@@ -1,8 +1,22 @@
 # Dados públicos
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import Optional, Dict, Any
-from .sheets_api import fetch_vendas_publicas
+from .sheets_api import fetch_planilha_versionada
+from .ingest import (
+    get_vendas_canonicas,
+    get_cursos_explodidos,
+    vendas_canonicas_da_versao
+)
+from .aggregations import contar_matriculas, contar_matriculas_cursos
+from .cube import (
+    get_cubos_vendas,
+    fatiar_cubo,
+    filtrar_validos,
+    somar_cubo,
+    VALORES_INVALIDOS
+)
 
 
 def get_dados_publicos_processados() -> Optional[Dict[str, Any]]:
@@ -10,7 +24,7 @@ def get_dados_publicos_processados() -> Optional[Dict[str, Any]]:
     Processa dados públicos para gráficos com filtros para dados vazios
     """
     try:
-        df_vendas = fetch_vendas_publicas()
+        df_vendas = get_vendas_canonicas()
 
         if df_vendas is not None and not df_vendas.empty:
             # Filtrar dados vazios e inválidos
@@ -34,47 +48,11 @@ def get_dados_publicos_processados() -> Optional[Dict[str, Any]]:
             if df_filtrado.empty:
                 return None
 
-            # Processar quantidade de matrículas para cálculo correto
-            if 'Qtd. Matrículas' in df_filtrado.columns:
-                df_filtrado['Qtd. Matrículas'] = pd.to_numeric(
-                    df_filtrado['Qtd. Matrículas'], errors='coerce').fillna(1)
-            else:
-                df_filtrado['Qtd. Matrículas'] = 1
-
-            # Processar modalidades considerando quantidade de matrículas
-            modalidades_count = {}
-            for _, row in df_filtrado.iterrows():
-                nivel = row['Nível'].strip()
-                qtd = row['Qtd. Matrículas']
-                modalidades_count[nivel] = modalidades_count.get(
-                    nivel, 0) + qtd
-
-            # Processar cursos considerando quantidade de matrículas e combos
-            cursos_count = {}
-            for _, row in df_filtrado.iterrows():
-                curso = row['Curso'].strip()
-                qtd = row['Qtd. Matrículas']
-
-                # Se for combo, contar cada curso separadamente
-                if 'combo' in curso.lower() and ',' in curso:
-                    cursos_combo = [c.strip() for c in curso.split(',')]
-                    for curso_individual in cursos_combo:
-                        if ':' in curso_individual:
-                            curso_individual = curso_individual.split(':')[
-                                1].strip()
-                        if curso_individual:  # Verificar se não está vazio
-                            cursos_count[curso_individual] = cursos_count.get(
-                                curso_individual, 0) + qtd
-                else:
-                    cursos_count[curso] = cursos_count.get(curso, 0) + qtd
-
-            # Ordenar e pegar top 10
-            modalidades_ordenadas = dict(
-                sorted(modalidades_count.items(),
-                       key=lambda x: x[1], reverse=True))
-            cursos_ordenados = dict(
-                sorted(cursos_count.items(),
-                       key=lambda x: x[1], reverse=True)[:10])
+            # Modalidades e top 10 cursos (combos contam cada curso)
+            modalidades_ordenadas = contar_matriculas(
+                df_filtrado, 'Nível', normalizar=True)
+            cursos_ordenados = contar_matriculas_cursos(
+                df_filtrado, limite=10, explosao=get_cursos_explodidos())
 
             # Calcular total de matrículas (não número de linhas)
             total_matriculas = df_filtrado['Qtd. Matrículas'].sum()
@@ -99,97 +77,32 @@ def get_dados_publicos_filtrados(
     Processa dados públicos com filtros de ano e mês
     """
     try:
-        df_vendas = fetch_vendas_publicas()
+        cubos = get_cubos_vendas()
 
-        if df_vendas is not None and not df_vendas.empty:
-            # Processar data de pagamento
-            if 'Dt Pagto' in df_vendas.columns:
-                df_vendas['Dt Pagto'] = pd.to_datetime(
-                    df_vendas['Dt Pagto'], format='%d/%m/%Y', errors='coerce')
-                # Remove linhas com datas inválidas
-                df_vendas = df_vendas.dropna(subset=['Dt Pagto'])
-
-            # Aplicar filtros de data
-            df_filtrado = df_vendas.copy()
-
-            if ano:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.year == ano]
-
-            if mes:
-                df_filtrado = df_filtrado[df_filtrado[
-                    'Dt Pagto'].dt.month == mes]
+        if cubos is not None:
+            # Aplicar filtros de data e remover datas, Nível e Curso inválidos
+            fatia = filtrar_validos(
+                fatiar_cubo(cubos['vendas'], None, ano, mes))
 
-            if df_filtrado.empty:
+            if fatia.empty:
                 return None
 
-            # Filtrar dados vazios e inválidos
-            df_filtrado = df_filtrado.dropna(subset=['Nível', 'Curso'])
-            df_filtrado = df_filtrado[
-                (df_filtrado['Nível'].str.strip() != '') &
-                (df_filtrado['Curso'].str.strip() != '')
-            ]
-
-            # Remove valores inválidos
-            valores_invalidos = ['-', 'n/a', 'null', 'none', '']
-            df_filtrado = df_filtrado[
-                ~df_filtrado['Nível'].str.lower().str.strip().isin(
-                    valores_invalidos) &
-                ~df_filtrado['Curso'].str.lower(
-                ).str.strip().isin(valores_invalidos)
-            ]
-
-            if df_filtrado.empty:
-                return None
+            fatia_cursos = filtrar_validos(
+                fatiar_cubo(cubos['cursos'], None, ano, mes))
 
-            # Processar quantidade de matrículas
-            if 'Qtd. Matrículas' in df_filtrado.columns:
-                df_filtrado['Qtd. Matrículas'] = pd.to_numeric(
-                    df_filtrado['Qtd. Matrículas'], errors='coerce').fillna(1)
-            else:
-                df_filtrado['Qtd. Matrículas'] = 1
-
-            # Processar modalidades
-            modalidades_count = {}
-            for _, row in df_filtrado.iterrows():
-                nivel = row['Nível'].strip()
-                qtd = row['Qtd. Matrículas']
-                modalidades_count[nivel] = modalidades_count.get(
-                    nivel, 0) + qtd
-
-            # Processar cursos
-            cursos_count = {}
-            for _, row in df_filtrado.iterrows():
-                curso = row['Curso'].strip()
-                qtd = row['Qtd. Matrículas']
-
-                if 'combo' in curso.lower() and ',' in curso:
-                    cursos_combo = [c.strip() for c in curso.split(',')]
-                    for curso_individual in cursos_combo:
-                        if ':' in curso_individual:
-                            curso_individual = curso_individual.split(':')[
-                                1].strip()
-                        if curso_individual:
-                            cursos_count[curso_individual] = cursos_count.get(
-                                curso_individual, 0) + qtd
-                else:
-                    cursos_count[curso] = cursos_count.get(curso, 0) + qtd
-
-            # Ordenar
-            modalidades_ordenadas = dict(
-                sorted(modalidades_count.items(),
-                       key=lambda x: x[1], reverse=True))
-            cursos_ordenados = dict(
-                sorted(cursos_count.items(),
-                       key=lambda x: x[1], reverse=True)[:10])
+            # Processar modalidades e cursos
+            modalidades_ordenadas = somar_cubo(
+                fatia, 'Nível', normalizar=True)
+            cursos_ordenados = somar_cubo(
+                fatia_cursos, 'curso_individual', limite=10)
 
-            total_matriculas = df_filtrado['Qtd. Matrículas'].sum()
+            total_matriculas = fatia['matriculas'].sum()
 
             return {
                 'modalidades': modalidades_ordenadas,
                 'cursos': cursos_ordenados,
                 'total_matriculas': int(total_matriculas),
-                'total_registros': len(df_filtrado)
+                'total_registros': int(fatia['vendas'].sum())
             }
 
         return None
@@ -199,86 +112,105 @@ def get_dados_publicos_filtrados(
         return None
 
 
-def get_evolucao_modalidades_mensal(
-        ano: int = 2025) -> Optional[Dict[str, Any]]:
-    """
-    Retorna evolução das modalidades mês a mês para um ano específico
-    """
-    try:
-        df_vendas = fetch_vendas_publicas()
-
-        if df_vendas is not None and not df_vendas.empty:
-            # Processar data de pagamento
-            if 'Dt Pagto' in df_vendas.columns:
-                df_vendas['Dt Pagto'] = pd.to_datetime(
-                    df_vendas['Dt Pagto'], format='%d/%m/%Y', errors='coerce')
-                df_vendas = df_vendas.dropna(subset=['Dt Pagto'])
-
-            # Filtrar pelo ano
-            df_ano = df_vendas[df_vendas['Dt Pagto'].dt.year == ano].copy()
+MESES_NOMES = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+}
 
-            if df_ano.empty:
-                return None
 
-            # Filtrar dados válidos
-            df_ano = df_ano.dropna(subset=['Nível'])
-            df_ano = df_ano[df_ano['Nível'].str.strip() != '']
-
-            valores_invalidos = ['-', 'n/a', 'null', 'none', '']
-            df_ano = df_ano[~df_ano['Nível'].str.lower(
-            ).str.strip().isin(valores_invalidos)]
-
-            if df_ano.empty:
-                return None
+def construir_evolucao_modalidades(
+        df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Tensor ano x mês x modalidade (linhas (Ano, Mes), colunas Nível):
+    - matriculas: soma de 'Qtd. Matrículas' (NaN onde não houve venda)
+    - percentuais: matriculas normalizadas pelo total da linha
+    - ordem: primeira linha da modalidade no mês (ordem de aparição)
+    - totais: matrículas do mês
+    """
+    niveis = df_vendas['Nível'].astype(object)
+    validos = df_vendas[
+        niveis.notna() & (niveis.str.strip() != '') &
+        ~niveis.str.lower().str.strip().isin(VALORES_INVALIDOS) &
+        (df_vendas['Ano'] > 0)]
+
+    base = pd.DataFrame({
+        'Ano': validos['Ano'],
+        'Mes': validos['Mes'],
+        'Nível': validos['Nível'].astype(object).str.strip(),
+        'matriculas': validos['Qtd. Matrículas'],
+        'ordem': np.arange(len(validos))
+    })
+
+    # Pivot (Ano, Mes) x Nível em um único groupby
+    agregado = base.groupby(['Ano', 'Mes', 'Nível'], sort=True).agg(
+        matriculas=('matriculas', 'sum'), ordem=('ordem', 'min'))
+    matriculas = agregado['matriculas'].unstack('Nível')
+    totais = base.groupby(['Ano', 'Mes'], sort=True)['matriculas'].sum()
+
+    return {
+        'matriculas': matriculas,
+        'percentuais': matriculas.div(totais, axis=0) * 100,
+        'ordem': agregado['ordem'].unstack('Nível'),
+        'totais': totais
+    }
+
+
+def evolucao_do_ano(tensor: Dict[str, pd.DataFrame],
+                    ano: int) -> Optional[Dict[str, Any]]:
+    """
+    Fatia o tensor em {nome do mês: {'modalidades': {nível: %}, 'total'}}
+    """
+    totais = tensor['totais']
+    if ano not in totais.index.get_level_values('Ano'):
+        return None
 
-            # Processar quantidade de matrículas
-            if 'Qtd. Matrículas' in df_ano.columns:
-                df_ano['Qtd. Matrículas'] = pd.to_numeric(
-                    df_ano['Qtd. Matrículas'], errors='coerce').fillna(1)
-            else:
-                df_ano['Qtd. Matrículas'] = 1
-
-            # Adicionar coluna de mês
-            df_ano['Mes'] = df_ano['Dt Pagto'].dt.month
-
-            # Calcular dados por mês
-            evolucao_data = {}
-            meses_nomes = {
-                1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
-                5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
-                9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
+    evolucao_data = {}
+    for mes, total_mes in totais.loc[ano].items():
+        if not 1 <= mes <= 12:
+            continue
+
+        modalidades_percentual = {}
+        if total_mes > 0:
+            percentuais = tensor['percentuais'].loc[(ano, mes)]
+            presentes = tensor['ordem'].loc[(ano, mes)].dropna().sort_values()
+            modalidades_percentual = {
+                modalidade: float(percentuais[modalidade])
+                for modalidade in presentes.index
             }
 
-            # Para cada mês, calcular as modalidades
-            for mes in range(1, 13):
-                df_mes = df_ano[df_ano['Mes'] == mes]
+        evolucao_data[MESES_NOMES[mes]] = {
+            'modalidades': modalidades_percentual,
+            'total': float(total_mes)
+        }
 
-                if not df_mes.empty:
-                    modalidades_mes = {}
-                    total_mes = 0
+    return evolucao_data
 
-                    for _, row in df_mes.iterrows():
-                        nivel = row['Nível'].strip()
-                        qtd = row['Qtd. Matrículas']
-                        modalidades_mes[nivel] = modalidades_mes.get(
-                            nivel, 0) + qtd
-                        total_mes += qtd
 
-                    # Converter para porcentagens
-                    modalidades_percentual = {}
-                    if total_mes > 0:
-                        for modalidade, qtd in modalidades_mes.items():
-                            modalidades_percentual[modalidade] = (
-                                qtd / total_mes) * 100
+@st.cache_resource(max_entries=2)
+def _evolucao_modalidades(versao: str,
+                          _df_vendas: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Monta o tensor de todos os anos uma vez por versão (compartilhado)
+    """
+    return construir_evolucao_modalidades(
+        vendas_canonicas_da_versao(versao, _df_vendas))
 
-                    evolucao_data[meses_nomes[mes]] = {
-                        'modalidades': modalidades_percentual,
-                        'total': total_mes
-                    }
 
-            return evolucao_data
+def get_evolucao_modalidades_mensal(
+        ano: int = 2025) -> Optional[Dict[str, Any]]:
+    """
+    Retorna evolução das modalidades mês a mês para um ano específico
+    """
+    try:
+        versao, dados = fetch_planilha_versionada('planilha_vendas')
+        df_vendas = dados.get('base_vendas')
 
-        return None
+        if versao is None or df_vendas is None or df_vendas.empty:
+            return None
+
+        # Trocar de ano só fatia o tensor já calculado para a versão
+        return evolucao_do_ano(_evolucao_modalidades(versao, df_vendas), ano)
 
     except Exception as e:
         st.error(f"Erro ao calcular evolução mensal das modalidades: {str(e)}")
@@ -1,83 +1,234 @@
 # Conexão com Google Sheets
+import time
+import numpy as np
 import pandas as pd
-import requests
 import streamlit as st
 from config import GOOGLE_SHEETS_CONFIG
-from typing import Optional
+from typing import Any, Optional, Dict, List, Tuple
+from .http_client import http_get
+from .snapshot_cache import (
+    obter_planilha,
+    carregar_snapshot,
+    invalidar_snapshots
+)
 
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
-def fetch_google_sheet_data(
+# Intervalo (segundos) entre recargas completas das abas incrementais,
+# para capturar edições em linhas antigas
+RECONCILIACAO_COMPLETA = 6 * 60 * 60
+
+
+def _values_to_dataframe(values: List[List[str]]) -> Optional[pd.DataFrame]:
+    """
+    Converte a matriz 'values' da API em DataFrame (primeira linha = cabeçalho)
+    """
+    if not values:
+        return None
+
+    # Primeira linha como cabeçalho
+    return _rows_to_dataframe(values[1:], values[0])
+
+
+def _rows_to_dataframe(rows: List[List[str]],
+                       headers: List[str]) -> pd.DataFrame:
+    """
+    Monta o DataFrame das linhas de dados com o cabeçalho informado.
+    Linhas curtas são completadas, linhas longas são truncadas e linhas
+    totalmente vazias são descartadas.
+    """
+    num_colunas = len(headers)
+
+    if not rows:
+        return pd.DataFrame(columns=headers)
+
+    # O construtor do pandas completa linhas irregulares com None em C,
+    # sem percorrer (nem alterar) as listas do JSON em Python; a cópia é
+    # gravável (com Copy-on-Write, to_numpy devolve visão somente leitura)
+    valores = pd.DataFrame(rows).to_numpy(dtype=object, copy=True)
+
+    if valores.shape[1] > num_colunas:
+        valores = valores[:, :num_colunas]
+    elif valores.shape[1] < num_colunas:
+        valores = np.hstack([valores, np.full(
+            (len(valores), num_colunas - valores.shape[1]), None, dtype=object)])
+
+    valores[pd.isna(valores)] = ''
+
+    # Remover linhas completamente vazias
+    valores = valores[(valores != '').any(axis=1)]
+
+    return pd.DataFrame(valores, columns=headers)
+
+
+class SheetsApiError(Exception):
+    """Resposta não esperada da API do Google Sheets"""
+
+
+def _batch_get_values(
         api_key: str,
         sheet_id: str,
-        range_name: str) -> Optional[pd.DataFrame]:
+        ranges: Tuple[str, ...]) -> List[List[List[str]]]:
+    """
+    Chama values:batchGet e retorna a matriz 'values' de cada range pedido.
+    Levanta exceção em caso de falha.
+    """
+    url = f"{SHEETS_API_URL}/{sheet_id}/values:batchGet"
+    response = http_get(url, params={'ranges': list(ranges), 'key': api_key})
+
+    if response.status_code != 200:
+        raise SheetsApiError(
+            f"Erro ao acessar planilha: {response.status_code}")
+
+    # A API devolve os valueRanges na mesma ordem dos ranges pedidos
+    value_ranges = response.json().get('valueRanges', [])
+    return [value_range.get('values', []) for value_range in value_ranges]
+
+
+def _cauda_confere(base: Optional[pd.DataFrame],
+                   aba_values: List[List[str]]) -> bool:
     """
-    Busca dados de uma planilha do Google Sheets
+    A cauda pedida começa na última linha já ingerida: ela precisa voltar
+    igual à última linha do snapshot. Se sumiu ou mudou, linhas antigas
+    foram excluídas ou movidas (a API não acusa erro quando o range fica
+    após os dados, só devolve vazio)
     """
+    if base is None or base.empty or not aba_values:
+        return False
+
+    ultima = _rows_to_dataframe(aba_values[:1], list(base.columns))
+    if ultima.empty:
+        return False
+
+    return ([str(valor) for valor in ultima.iloc[0]] ==
+            [str(valor) for valor in base.iloc[-1]])
+
+
+def _buscar_planilha_remota(
+        planilha: str,
+        meta_anterior: Optional[dict] = None,
+        forcar: bool = False) -> Tuple[
+            Dict[str, Optional[pd.DataFrame]], Dict[str, Any]]:
+    """
+    Busca todas as abas configuradas da planilha direto na API.
+    Abas incrementais pedem só as linhas a partir da última já ingerida e
+    são anexadas ao snapshot anterior; a planilha inteira é recarregada a
+    cada RECONCILIACAO_COMPLETA, quando a busca é forçada (botão de
+    atualizar) ou quando a última linha ingerida não confere.
+    """
+    config = GOOGLE_SHEETS_CONFIG[planilha]
+    abas = config['abas']
+
+    anterior = meta_anterior or {}
+    linhas_anteriores = anterior.get('linhas', {})
+    carga_completa = forcar or (
+        time.time() - anterior.get('carga_completa_em', 0)
+        > RECONCILIACAO_COMPLETA)
+
+    # Linhas de dados já ingeridas por aba incremental (cabeçalho = linha 1)
+    incrementais = {} if carga_completa else {
+        chave: linhas_anteriores[chave]
+        for chave in config.get('abas_incrementais', [])
+        if linhas_anteriores.get(chave)
+    }
+
+    # A linha {n + 1} da planilha é a última já ingerida (conferida antes
+    # de anexar as seguintes)
+    ranges = tuple(
+        f"'{nome_aba}'!A{incrementais[chave] + 1}:ZZ"
+        if chave in incrementais else nome_aba
+        for chave, nome_aba in abas.items())
+
     try:
-        url = f"https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values/{range_name}?key={api_key}"
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            data = response.json()
-            values = data.get('values', [])
-
-            if values:
-                # Primeira linha como cabeçalho
-                headers = values[0]
-                rows = values[1:]
-
-                # Verificar se todas as linhas têm o mesmo número de colunas
-                max_cols = len(headers)
-
-                # Normalizar todas as linhas para ter o mesmo número de colunas
-                normalized_rows = []
-                for i, row in enumerate(rows):
-                    if len(row) < max_cols:
-                        row.extend([''] * (max_cols - len(row)))
-                    # Se a linha tem mais colunas que o cabeçalho, truncar
-                    elif len(row) > max_cols:
-                        row = row[:max_cols]
-                    normalized_rows.append(row)
-
-                # Criar DataFrame com linhas normalizadas
-                df = pd.DataFrame(normalized_rows, columns=headers)
-
-                # Remover linhas completamente vazias
-                df = df.dropna(how='all')
-
-                return df
-            else:
-                st.warning(f"Nenhum dado encontrado na aba: {range_name}")
-                return None
+        values = _batch_get_values(
+            config['API_KEY'], config['SHEET_ID'], ranges)
+    except SheetsApiError:
+        if not incrementais:
+            raise
+        # Range da cauda inválido (ex.: fora da grade): recarga completa
+        return _buscar_planilha_remota(planilha, forcar=True)
+
+    frames_anteriores = carregar_snapshot(
+        planilha, anterior['versao'],
+        tuple(anterior['abas'])) if incrementais else {}
+
+    frames = {}
+    linhas = {}
+    for chave, aba_values in zip(abas, values):
+        if chave in incrementais:
+            base = frames_anteriores[chave]
+            if not _cauda_confere(base, aba_values):
+                # Planilha encolheu ou linhas antigas mudaram de lugar
+                return _buscar_planilha_remota(planilha, forcar=True)
+
+            novas = _rows_to_dataframe(aba_values[1:], list(base.columns))
+            frames[chave] = pd.concat(
+                [base, novas], ignore_index=True) if not novas.empty else base
+            linhas[chave] = incrementais[chave] + len(aba_values) - 1
         else:
-            st.error(f"Erro ao acessar planilha: {response.status_code}")
-            return None
+            frames[chave] = _values_to_dataframe(aba_values)
+            linhas[chave] = len(aba_values) - 1 if aba_values else None
+
+    extras = {
+        'linhas': linhas,
+        'carga_completa_em': time.time() if carga_completa else anterior[
+            'carga_completa_em']
+    }
+
+    return frames, extras
+
+
+def fetch_planilha_versionada(
+        planilha: str) -> Tuple[Optional[str], Dict[str, Optional[pd.DataFrame]]]:
+    """
+    Retorna (versão, abas) da planilha a partir do snapshot local em Parquet.
+    O snapshot é servido na hora e revalidado em segundo plano após o TTL.
+    """
+    try:
+        return obter_planilha(
+            planilha,
+            lambda meta, forcar: _buscar_planilha_remota(
+                planilha, meta, forcar))
 
     except Exception as e:
         st.error(f"Erro ao buscar dados: {str(e)}")
-        return None
+        abas = GOOGLE_SHEETS_CONFIG[planilha]['abas']
+        return None, {chave: None for chave in abas}
+
+
+def fetch_planilha_data(planilha: str) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Busca todas as abas configuradas de uma planilha do GOOGLE_SHEETS_CONFIG
+    (via snapshot local). Retorna um DataFrame por chave de aba.
+    """
+    versao, dados = fetch_planilha_versionada(planilha)
+
+    if versao is not None:
+        abas = GOOGLE_SHEETS_CONFIG[planilha]['abas']
+        for chave, df in dados.items():
+            if df is None:
+                st.warning(f"Nenhum dado encontrado na aba: {abas[chave]}")
+
+    return dados
+
+
+def invalidar_cache_planilhas() -> None:
+    """
+    Descarta os caches em memória e força nova busca das planilhas
+    """
+    invalidar_snapshots()
+    st.cache_data.clear()
 
 
 def fetch_parceiros_data() -> Optional[pd.DataFrame]:
     """
     Busca dados da aba 'Relação de Parceiros'
     """
-    config = GOOGLE_SHEETS_CONFIG['planilha_vendas']
-    return fetch_google_sheet_data(
-        config['API_KEY'],
-        config['SHEET_ID'],
-        config['abas']['dados_parceiros']
-    )
+    return fetch_planilha_data('planilha_vendas')['dados_parceiros']
 
 
 def fetch_vendas_publicas() -> Optional[pd.DataFrame]:
     """
     Busca dados da aba 'Base de Vendas' (dados públicos)
     """
-    config = GOOGLE_SHEETS_CONFIG['planilha_vendas']
-    return fetch_google_sheet_data(
-        config['API_KEY'],
-        config['SHEET_ID'],
-        config['abas']['base_vendas']
-    )
+    return fetch_planilha_data('planilha_vendas')['base_vendas']
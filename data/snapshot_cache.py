@@ -0,0 +1,256 @@
+# Snapshots locais das planilhas em Parquet (stale-while-revalidate)
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+from typing import Any, Callable, Dict, Optional, Tuple
+
+SNAPSHOT_DIR = os.getenv(
+    'UNIDASH_SNAPSHOT_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                 '.cache', 'snapshots'))
+
+# Idade (segundos) a partir da qual o snapshot é revalidado em segundo plano
+SNAPSHOT_TTL = 300
+
+# Versões antigas mantidas em disco para leitores concorrentes
+VERSOES_MANTIDAS = 3
+
+_METADADOS = 'meta.json'
+_CHAVE_COLUNAS = b'unidash_colunas'
+
+Frames = Dict[str, Optional[pd.DataFrame]]
+
+# Recebe os metadados do snapshot anterior (ou None) e se a busca foi
+# forçada (invalidação pedida pelo usuário); retorna as abas junto com
+# informações extras a guardar nos metadados
+Buscador = Callable[[Optional[dict], bool], Tuple[Frames, Dict[str, Any]]]
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_em_revalidacao = set()
+_invalidado_em = 0.0
+_forcado_em: Dict[str, float] = {}
+
+
+def _diretorio(planilha: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, planilha)
+
+
+def _escrever_atomico(caminho: str, escrever: Callable[[str], None]) -> None:
+    """Escreve em arquivo temporário e troca de uma vez (os.replace)"""
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    escrever(temporario)
+    os.replace(temporario, caminho)
+
+
+def ler_metadados(planilha: str) -> Optional[dict]:
+    """
+    Lê os metadados do último snapshot salvo (None se não houver)
+    """
+    try:
+        with open(os.path.join(_diretorio(planilha), _METADADOS),
+                  encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _versao_conteudo(frames: Frames) -> str:
+    """Hash do conteúdo das abas - dados iguais mantêm a mesma versão"""
+    digest = hashlib.sha1()
+    for aba in sorted(frames):
+        df = frames[aba]
+        digest.update(aba.encode('utf-8'))
+        if df is None:
+            continue
+        digest.update(json.dumps(list(map(str, df.columns))).encode('utf-8'))
+        digest.update(
+            pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _salvar_aba(df: pd.DataFrame, caminho: str) -> None:
+    """
+    Salva a aba com colunas posicionais (o cabeçalho da planilha pode ter
+    nomes vazios ou repetidos) e guarda o cabeçalho original no schema.
+    """
+    posicional = df.set_axis(
+        [f"c{i}" for i in range(df.shape[1])], axis=1)
+    tabela = pa.Table.from_pandas(posicional, preserve_index=False)
+    tabela = tabela.replace_schema_metadata({
+        **(tabela.schema.metadata or {}),
+        _CHAVE_COLUNAS: json.dumps(list(map(str, df.columns))).encode('utf-8')
+    })
+    _escrever_atomico(caminho, lambda tmp: pq.write_table(tabela, tmp))
+
+
+def _ler_aba(caminho: str) -> pd.DataFrame:
+    tabela = pq.read_table(caminho)
+    colunas = json.loads(tabela.schema.metadata[_CHAVE_COLUNAS])
+    return tabela.to_pandas().set_axis(colunas, axis=1)
+
+
+def _limpar_versoes_antigas(planilha: str) -> None:
+    diretorio = _diretorio(planilha)
+    arquivos = {}
+    for nome in os.listdir(diretorio):
+        if nome.endswith('.parquet') and '-' in nome:
+            versao = nome.rsplit('-', 1)[1][:-len('.parquet')]
+            caminho = os.path.join(diretorio, nome)
+            arquivos.setdefault(versao, []).append(caminho)
+
+    por_idade = sorted(
+        arquivos.items(),
+        key=lambda item: max(os.path.getmtime(c) for c in item[1]),
+        reverse=True)
+
+    for _, caminhos in por_idade[VERSOES_MANTIDAS:]:
+        for caminho in caminhos:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+
+def salvar_snapshot(planilha: str, frames: Frames,
+                    extras: Optional[Dict[str, Any]] = None) -> dict:
+    """
+    Persiste as abas da planilha em Parquet e retorna os novos metadados
+    """
+    diretorio = _diretorio(planilha)
+    os.makedirs(diretorio, exist_ok=True)
+
+    versao = _versao_conteudo(frames)
+    anterior = ler_metadados(planilha)
+
+    if anterior is None or anterior.get('versao') != versao:
+        for aba, df in frames.items():
+            if df is not None:
+                _salvar_aba(df, os.path.join(
+                    diretorio, f"{aba}-{versao}.parquet"))
+
+    meta = {
+        **(extras or {}),
+        'versao': versao,
+        'atualizado_em': time.time(),
+        'abas': sorted(frames)
+    }
+
+    def escrever_meta(tmp: str) -> None:
+        with open(tmp, 'w', encoding='utf-8') as arquivo:
+            json.dump(meta, arquivo)
+
+    _escrever_atomico(os.path.join(diretorio, _METADADOS), escrever_meta)
+    _limpar_versoes_antigas(planilha)
+
+    return meta
+
+
+def compartilhar(df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """
+    Entrega um DataFrame compartilhado sem copiar os dados: a cópia rasa
+    tem índice/colunas próprios e os mesmos arrays do cache; com
+    Copy-on-Write (ativado na inicialização do app e das CLIs), qualquer
+    escrita nela fica local à cópia
+    """
+    return df.copy(deep=False) if df is not None else None
+
+
+@st.cache_resource(max_entries=8)
+def _snapshot_compartilhado(planilha: str, versao: str,
+                            abas: Tuple[str, ...]) -> Frames:
+    frames = {}
+    for aba in abas:
+        caminho = os.path.join(_diretorio(planilha), f"{aba}-{versao}.parquet")
+        frames[aba] = _ler_aba(caminho) if os.path.exists(caminho) else None
+    return frames
+
+
+def carregar_snapshot(planilha: str, versao: str,
+                      abas: Tuple[str, ...]) -> Frames:
+    """
+    Carrega uma versão do snapshot do disco (abas sem arquivo voltam None).
+    A leitura acontece uma vez por versão e todas as sessões recebem
+    visões dos mesmos arrays (Copy-on-Write), sem cópia por acesso.
+    """
+    return {
+        aba: compartilhar(df)
+        for aba, df in _snapshot_compartilhado(planilha, versao, abas).items()
+    }
+
+
+def _atualizar(planilha: str, buscar: Buscador,
+               anterior: Optional[dict], forcar: bool = False) -> dict:
+    frames, extras = buscar(anterior, forcar)
+    return salvar_snapshot(planilha, frames, extras)
+
+
+def _revalidar(planilha: str, buscar: Buscador,
+               anterior: Optional[dict]) -> None:
+    try:
+        _atualizar(planilha, buscar, anterior)
+    except Exception as e:
+        # Mantém o último snapshot válido (ex.: Google fora do ar)
+        logger.warning("Falha ao revalidar snapshot '%s': %s", planilha, e)
+    finally:
+        with _lock:
+            _em_revalidacao.discard(planilha)
+
+
+def _revalidar_em_segundo_plano(planilha: str, buscar: Buscador,
+                                anterior: Optional[dict]) -> None:
+    with _lock:
+        if planilha in _em_revalidacao:
+            return
+        _em_revalidacao.add(planilha)
+
+    threading.Thread(
+        target=_revalidar, args=(planilha, buscar, anterior),
+        name=f"revalidar-{planilha}", daemon=True).start()
+
+
+def invalidar_snapshots() -> None:
+    """
+    Força a próxima leitura de cada planilha a buscar dados novos
+    """
+    global _invalidado_em
+    _invalidado_em = time.time()
+
+
+def obter_planilha(planilha: str,
+                   buscar: Buscador) -> Tuple[str, Frames]:
+    """
+    Retorna (versão, abas) servindo o último snapshot imediatamente.
+    - Sem snapshot (ou invalidado): busca de forma síncrona
+    - Snapshot mais velho que SNAPSHOT_TTL: revalida em segundo plano
+    - Falha na busca com snapshot existente: segue com o snapshot
+    """
+    meta = ler_metadados(planilha)
+
+    # Uma única busca síncrona por invalidação, mesmo se ela falhar
+    forcar = _forcado_em.get(planilha, 0.0) < _invalidado_em and (
+        meta is None or meta['atualizado_em'] < _invalidado_em)
+
+    if meta is None or forcar:
+        _forcado_em[planilha] = time.time()
+        try:
+            meta = _atualizar(planilha, buscar, meta, forcar=forcar)
+        except Exception as e:
+            if meta is None:
+                raise
+            logger.warning(
+                "Falha ao atualizar '%s', usando snapshot: %s", planilha, e)
+
+    elif time.time() - meta['atualizado_em'] > SNAPSHOT_TTL:
+        _revalidar_em_segundo_plano(planilha, buscar, meta)
+
+    return meta['versao'], carregar_snapshot(
+        planilha, meta['versao'], tuple(meta['abas']))
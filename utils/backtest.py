@@ -0,0 +1,257 @@
+# Backtest dos modelos de projeção com origens móveis
+# Uso: python -m utils.backtest [--sinteticos 300] [--horizonte 6] [--saida backtest.csv]
+import argparse
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.context import BaseContext
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from data.partner_data import MESES_VENDAS, montar_matriz_vendas_mensais
+from data.snapshot_cache import carregar_snapshot, ler_metadados
+from utils.projections import SalesProjector, _fit_arima
+
+MODELOS = ("Média de Variação", "Regressão Linear", "Média Móvel", "ARIMA")
+
+# Meses com venda exigidos antes da primeira origem de previsão
+HISTORICO_MINIMO = 3
+
+# Parceiros enviados de uma vez a cada processo
+PARCEIROS_POR_LOTE = 16
+
+
+def gerar_matriz_sintetica(parceiros: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Matriz parceiros x meses com nível, tendência e ruído por parceiro,
+    ~10% de meses sem venda e parte dos parceiros com o ano incompleto
+    """
+    rng = np.random.default_rng(seed)
+    nivel = rng.uniform(5, 80, size=(parceiros, 1))
+    tendencia = rng.normal(0, 2, size=(parceiros, 1))
+    ruido = rng.normal(0, 0.25, size=(parceiros, 12)) * nivel
+
+    valores = np.round(np.maximum(
+        0, nivel + tendencia * np.arange(12) + ruido))
+    valores[rng.random((parceiros, 12)) < 0.1] = 0
+
+    # Meses ainda não fechados ficam zerados, como na planilha
+    meses_fechados = rng.integers(6, 13, size=parceiros)
+    valores[np.arange(12)[None, :] >= meses_fechados[:, None]] = 0
+
+    return pd.DataFrame(valores, columns=MESES_VENDAS, index=pd.Index(
+        [f'Parceiro {i}' for i in range(parceiros)], name='Parceiro'))
+
+
+def carregar_matriz_snapshot() -> pd.DataFrame:
+    """
+    Matriz de vendas mensais do último snapshot local da planilha de vendas
+    (sem acessar o Google Sheets)
+    """
+    meta = ler_metadados('planilha_vendas')
+    if meta is None:
+        raise ValueError("Nenhum snapshot local de 'planilha_vendas'")
+
+    df_parceiros = carregar_snapshot(
+        'planilha_vendas', meta['versao'], ('dados_parceiros',)
+    )['dados_parceiros']
+
+    if df_parceiros is None or df_parceiros.empty:
+        raise ValueError("Snapshot sem a aba de parceiros")
+
+    return montar_matriz_vendas_mensais(df_parceiros)
+
+
+def _projetar(projector: SalesProjector, vendas_mensais: Dict[str, float],
+              horizonte: int, modelo: str) -> Tuple[Dict, float]:
+    inicio = time.perf_counter()
+    resultado = projector.calculate_projections(
+        vendas_mensais, horizonte, modelo)
+    return resultado, time.perf_counter() - inicio
+
+
+def avaliar_parceiro(parceiro: str, valores: Sequence[float],
+                     modelos: Sequence[str] = MODELOS, horizonte: int = 6,
+                     historico_minimo: int = HISTORICO_MINIMO,
+                     medir_ajuste: bool = False) -> List[dict]:
+    """
+    Repete a projeção do parceiro a cada origem (mês) do histórico: só os
+    meses anteriores à origem entram no ajuste e os seguintes, até o último
+    mês com venda, são comparados com a projeção. Uma linha por
+    (modelo, origem, horizonte).
+
+    Tempos por origem: previsão = calculate_projections com o ajuste já em
+    cache; ajuste = chamada sem cache menos a previsão (nos modelos de
+    forma fechada o ajuste faz parte da previsão e fica perto de zero).
+    medir_ajuste esvazia o cache de ARIMA do processo a cada chamada sem
+    cache: só deve ser usado nos processos do pool.
+    """
+    valores = np.asarray(valores, dtype=float)
+    com_venda = np.flatnonzero(valores > 0)
+    if len(com_venda) <= historico_minimo:
+        return []
+
+    ultimo_mes = com_venda[-1] + 1
+    projector = SalesProjector()
+    linhas = []
+
+    for origem in range(1, ultimo_mes):
+        if (valores[:origem] > 0).sum() < historico_minimo:
+            continue
+
+        passos = min(horizonte, ultimo_mes - origem)
+        vendas_mensais = {
+            mes: (valores[i] if i < origem else 0)
+            for i, mes in enumerate(MESES_VENDAS)
+        }
+
+        for modelo in modelos:
+            if medir_ajuste:
+                _fit_arima.cache_clear()
+            _, tempo_total = _projetar(
+                projector, vendas_mensais, passos, modelo)
+            resultado, tempo_previsao = _projetar(
+                projector, vendas_mensais, passos, modelo)
+
+            for passo in range(passos):
+                linhas.append({
+                    'parceiro': parceiro,
+                    'modelo': modelo,
+                    'origem': origem + 1,
+                    'horizonte': passo + 1,
+                    'real': valores[origem + passo],
+                    'projecao': resultado['projecoes_mensais'][passo],
+                    'limite_inferior':
+                        resultado['lower_bounds_mensais'][passo],
+                    'limite_superior':
+                        resultado['upper_bounds_mensais'][passo],
+                    'tempo_ajuste_ms':
+                        max(0.0, tempo_total - tempo_previsao) * 1000,
+                    'tempo_previsao_ms': tempo_previsao * 1000
+                })
+
+    return linhas
+
+
+def _avaliar_lote(lote: List[Tuple[str, np.ndarray]], modelos: Sequence[str],
+                  horizonte: int, historico_minimo: int) -> List[dict]:
+    """
+    Roda só nos processos do pool: o filtro de avisos e o cache de ARIMA
+    esvaziado são do processo trabalhador, nunca do servidor
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return [linha for parceiro, valores in lote
+                for linha in avaliar_parceiro(
+                    parceiro, valores, modelos, horizonte, historico_minimo,
+                    medir_ajuste=True)]
+
+
+def resumir_backtest(detalhes: pd.DataFrame) -> pd.DataFrame:
+    """
+    MAE, MAPE (%, só meses com venda), cobertura do intervalo e tempos
+    médios por modelo e horizonte
+    """
+    erro = (detalhes['projecao'] - detalhes['real']).abs()
+    base = detalhes.assign(
+        erro_absoluto=erro,
+        erro_percentual=(erro / detalhes['real'].where(
+            detalhes['real'] > 0)) * 100,
+        coberto=detalhes['real'].between(
+            detalhes['limite_inferior'], detalhes['limite_superior']),
+        modelo=pd.Categorical(detalhes['modelo'], categories=MODELOS))
+
+    return base.groupby(['modelo', 'horizonte'], observed=True).agg(
+        avaliacoes=('erro_absoluto', 'size'),
+        mae=('erro_absoluto', 'mean'),
+        mape=('erro_percentual', 'mean'),
+        cobertura=('coberto', 'mean'),
+        tempo_ajuste_ms=('tempo_ajuste_ms', 'mean'),
+        tempo_previsao_ms=('tempo_previsao_ms', 'mean')
+    ).reset_index()
+
+
+def executar_backtest(matriz_vendas: pd.DataFrame,
+                      modelos: Sequence[str] = MODELOS, horizonte: int = 6,
+                      historico_minimo: int = HISTORICO_MINIMO,
+                      processos: Optional[int] = None,
+                      contexto: Optional[BaseContext] = None
+                      ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Backtest de todos os parceiros da matriz (get_matriz_vendas_mensais),
+    em paralelo por lotes de parceiros; sempre em processos separados,
+    mesmo com processos=1. Retorna (resumo, detalhes).
+    contexto: contexto de multiprocessing do pool (ex.: 'spawn' quando
+    chamado de dentro do servidor, que tem threads ativas).
+    """
+    for modelo in modelos:
+        if modelo not in MODELOS:
+            raise ValueError(f"Modelo inválido: {modelo}")
+
+    valores = matriz_vendas.reindex(
+        columns=MESES_VENDAS, fill_value=0).to_numpy(dtype=float)
+    parceiros = list(zip(matriz_vendas.index.astype(str), valores))
+    lotes = [parceiros[i:i + PARCEIROS_POR_LOTE]
+             for i in range(0, len(parceiros), PARCEIROS_POR_LOTE)]
+
+    processos = processos or os.cpu_count() or 1
+    avaliar = partial(_avaliar_lote, modelos=modelos, horizonte=horizonte,
+                      historico_minimo=historico_minimo)
+
+    with ProcessPoolExecutor(max_workers=processos,
+                             mp_context=contexto) as executor:
+        resultados = list(executor.map(avaliar, lotes))
+
+    detalhes = pd.DataFrame(
+        [linha for lote in resultados for linha in lote],
+        columns=['parceiro', 'modelo', 'origem', 'horizonte', 'real',
+                 'projecao', 'limite_inferior', 'limite_superior',
+                 'tempo_ajuste_ms', 'tempo_previsao_ms'])
+
+    return resumir_backtest(detalhes), detalhes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backtest com origens móveis dos modelos de projeção")
+    parser.add_argument('--sinteticos', type=int, metavar='PARCEIROS',
+                        help="Usa séries sintéticas em vez do snapshot local")
+    parser.add_argument('--modelos', nargs='+', choices=MODELOS,
+                        default=list(MODELOS))
+    parser.add_argument('--horizonte', type=int, default=6)
+    parser.add_argument('--historico-minimo', type=int,
+                        default=HISTORICO_MINIMO)
+    parser.add_argument('--processos', type=int,
+                        help="Processos em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument('--saida', default='backtest_projecoes.csv',
+                        help="CSV com o resumo por modelo e horizonte")
+    parser.add_argument('--detalhes',
+                        help="CSV opcional com cada previsão avaliada")
+    args = parser.parse_args()
+
+    if args.sinteticos:
+        matriz = gerar_matriz_sintetica(args.sinteticos)
+    else:
+        matriz = carregar_matriz_snapshot()
+
+    inicio = time.perf_counter()
+    resumo, detalhes = executar_backtest(
+        matriz, args.modelos, args.horizonte, args.historico_minimo,
+        args.processos)
+    duracao = time.perf_counter() - inicio
+
+    resumo.to_csv(args.saida, index=False)
+    if args.detalhes:
+        detalhes.to_csv(args.detalhes, index=False)
+
+    with pd.option_context('display.width', 120,
+                           'display.float_format', '{:.2f}'.format):
+        print(resumo.to_string(index=False))
+    print(f"{len(matriz)} parceiros, {len(detalhes)} previsões em "
+          f"{duracao:.1f} s -> {args.saida}")
+
+
+if __name__ == '__main__':
+    main()
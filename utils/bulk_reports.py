@@ -0,0 +1,178 @@
+# Relatórios de todos os parceiros em lote (um zip)
+# Uso: python -m utils.bulk_reports --ano 2025 --mes 9 [--saida relatorios.zip]
+import argparse
+import os
+import re
+import zipfile
+from concurrent.futures import (
+    FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait)
+from typing import IO, Iterator, List, Optional, Sequence, Set, Tuple, Union
+import pandas as pd
+from data.fetch_data import get_vendas_canonicas
+from utils.report_generator import ReportGenerator
+from utils.xlsx_stream import novo_arquivo, ler_arquivo
+
+TIPOS_LOTE = ('Resumo de Vendas', 'Dados Detalhados')
+EXTENSOES_LOTE = {'excel': 'xlsx', 'pdf': 'pdf'}
+
+# Parceiros enviados aos processos por trabalhador antes de esperar
+# resultados (limita a memória de frames e relatórios em trânsito)
+PARCEIROS_EM_TRANSITO = 2
+
+
+def nome_arquivo_seguro(texto: str) -> str:
+    """Nome de parceiro utilizável como nome de arquivo"""
+    return re.sub(r'[^\w\-]+', '_', texto).strip('_') or 'parceiro'
+
+
+def nome_arquivo_unico(parceiro_nome: str, usados: Set[str]) -> str:
+    """
+    nome_arquivo_seguro sem repetir um nome já usado no lote: parceiros
+    que só diferem em pontuação, espaços ou maiúsculas recebem _2, _3...
+    (senão um arquivo sobrescreveria o outro ao extrair o zip)
+    """
+    base = nome_arquivo_seguro(parceiro_nome)
+    nome, sufixo = base, 1
+    while nome.casefold() in usados:
+        sufixo += 1
+        nome = f"{base}_{sufixo}"
+
+    usados.add(nome.casefold())
+    return nome
+
+
+def particionar_por_parceiro(df_vendas: pd.DataFrame, ano: int = None,
+                             mes: int = None
+                             ) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Aplica o filtro de período uma vez na base inteira e a separa por
+    parceiro (mesmas linhas de get_filtered_sales_data para cada um)
+    """
+    if ano:
+        df_vendas = df_vendas[df_vendas['Ano'] == ano]
+
+    if mes:
+        df_vendas = df_vendas[df_vendas['Mes'] == mes]
+
+    for parceiro, grupo in df_vendas.groupby(
+            'Parceiro', observed=True, sort=True):
+        yield str(parceiro), grupo
+
+
+def renderizar_parceiro(parceiro_nome: str, df_vendas: pd.DataFrame,
+                        ano: int = None, mes: int = None,
+                        tipo: str = 'Resumo de Vendas',
+                        formatos: Sequence[str] = ('excel', 'pdf'),
+                        nome_arquivo: Optional[str] = None
+                        ) -> List[Tuple[str, bytes]]:
+    """
+    Gera os relatórios de um parceiro a partir das suas vendas;
+    retorna (nome do arquivo no zip, conteúdo). Roda nos processos do pool.
+    nome_arquivo: parceiro no nome dos arquivos (padrão:
+    nome_arquivo_seguro do nome do parceiro)
+    """
+    gerador = ReportGenerator()
+    detalhado = tipo == 'Dados Detalhados'
+    nome_arquivo = nome_arquivo or nome_arquivo_seguro(parceiro_nome)
+    prefixo = (f"relatorio_{nome_arquivo}_"
+               f"{tipo.lower().replace(' ', '_')}")
+
+    arquivos = []
+    for formato in formatos:
+        if formato == 'pdf':
+            dados = gerador.build_pdf_report(
+                df_vendas, parceiro_nome, ano, mes, detailed=detalhado)
+        elif detalhado:
+            arquivo = novo_arquivo()
+            gerador.write_detailed_report_excel(df_vendas, arquivo, ano, mes)
+            dados = ler_arquivo(arquivo)
+        else:
+            dados = gerador.build_summary_report_excel(df_vendas, ano, mes)
+
+        arquivos.append((f"{prefixo}.{EXTENSOES_LOTE[formato]}", dados))
+
+    return arquivos
+
+
+def gerar_relatorios_lote(destino: Union[str, IO[bytes]],
+                          ano: int = None, mes: int = None,
+                          tipo: str = 'Resumo de Vendas',
+                          formatos: Sequence[str] = ('excel', 'pdf'),
+                          processos: Optional[int] = None,
+                          df_vendas: Optional[pd.DataFrame] = None) -> int:
+    """
+    Gera os relatórios de todos os parceiros em paralelo (um processo por
+    núcleo) e grava cada arquivo no zip assim que fica pronto.
+    Retorna a quantidade de parceiros incluídos.
+    """
+    if tipo not in TIPOS_LOTE:
+        raise ValueError(f"Tipo de relatório inválido: {tipo}")
+
+    formatos = tuple(formatos)
+    for formato in formatos:
+        if formato not in EXTENSOES_LOTE:
+            raise ValueError(f"Formato inválido: {formato}")
+
+    if df_vendas is None:
+        df_vendas = get_vendas_canonicas()
+
+    if df_vendas is None or df_vendas.empty:
+        raise ValueError("Base de vendas indisponível")
+
+    processos = processos or os.cpu_count() or 1
+    total = 0
+    # Nomes atribuídos na ordem dos parceiros (determinística), não na
+    # ordem em que os processos terminam
+    nomes_usados: Set[str] = set()
+
+    with zipfile.ZipFile(destino, 'w', zipfile.ZIP_DEFLATED) as saida, \
+            ProcessPoolExecutor(max_workers=processos) as executor:
+
+        def gravar(concluidos) -> None:
+            for futuro in concluidos:
+                for nome, dados in futuro.result():
+                    saida.writestr(nome, dados)
+
+        pendentes = set()
+        for parceiro, grupo in particionar_por_parceiro(df_vendas, ano, mes):
+            if len(pendentes) >= processos * PARCEIROS_EM_TRANSITO:
+                concluidos, pendentes = wait(
+                    pendentes, return_when=FIRST_COMPLETED)
+                gravar(concluidos)
+
+            pendentes.add(executor.submit(
+                renderizar_parceiro, parceiro, grupo, ano, mes, tipo,
+                formatos, nome_arquivo_unico(parceiro, nomes_usados)))
+            total += 1
+
+        gravar(as_completed(pendentes))
+
+    return total
+
+
+def main():
+    # Mesmo modo do app: a base compartilhada não é alterada pelos relatórios
+    pd.set_option('mode.copy_on_write', True)
+
+    parser = argparse.ArgumentParser(
+        description="Gera os relatórios de todos os parceiros em um zip")
+    parser.add_argument('--ano', type=int)
+    parser.add_argument('--mes', type=int)
+    parser.add_argument('--tipo', choices=TIPOS_LOTE,
+                        default='Resumo de Vendas')
+    parser.add_argument('--formatos', nargs='+', choices=list(EXTENSOES_LOTE),
+                        default=['excel', 'pdf'])
+    parser.add_argument('--processos', type=int,
+                        help="Processos em paralelo (padrão: núcleos da CPU)")
+    parser.add_argument('--saida', help="Arquivo zip de destino")
+    args = parser.parse_args()
+
+    saida = args.saida or (
+        f"relatorios_{args.ano or 'todos'}_{args.mes or 'todos'}.zip")
+    total = gerar_relatorios_lote(saida, args.ano, args.mes, args.tipo,
+                                  args.formatos, args.processos)
+    print(f"{total} parceiros -> {saida}")
+
+
+if __name__ == '__main__':
+    main()
@@ -801,6 +801,65 @@ def create_modalidades_comparativo_chart(
     return fig
 
 
+def create_modalidades_periodos_chart(
+        dados_periodos: Dict[str, Dict[str, int]]) -> go.Figure:
+    """
+    Cria gráfico comparativo de modalidades (%) para períodos arbitrários
+    """
+    todas_modalidades = set()
+    for dados in dados_periodos.values():
+        if dados:
+            todas_modalidades.update(dados.keys())
+
+    fig = go.Figure()
+
+    if not todas_modalidades:
+        fig.add_annotation(
+            text="Nenhum dado disponível",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, xanchor='center', yanchor='middle',
+            showarrow=False, font=dict(size=16)
+        )
+        fig.update_layout(
+            title='📊 Comparativo de Modalidades',
+            template='plotly_white',
+            height=500
+        )
+        return fig
+
+    modalidades_list = sorted(todas_modalidades)
+    cores = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#95a5a6']
+
+    for i, (rotulo, dados) in enumerate(dados_periodos.items()):
+        if not dados:
+            continue
+
+        total = sum(dados.values())
+        valores = [(dados.get(mod, 0) / total * 100) if total > 0 else 0
+                   for mod in modalidades_list]
+
+        fig.add_trace(go.Bar(
+            name=rotulo,
+            x=modalidades_list,
+            y=valores,
+            marker_color=cores[i % len(cores)],
+            text=[f"{v:.1f}%" for v in valores],
+            textposition='outside'
+        ))
+
+    fig.update_layout(
+        title='📊 Comparativo de Modalidades por Período (%)',
+        xaxis_title='Modalidades',
+        yaxis_title='Percentual (%)',
+        template='plotly_white',
+        height=500,
+        barmode='group',
+        xaxis=dict(tickangle=45)
+    )
+
+    return fig
+
+
 def create_projection_summary_cards(projecoes: Dict, targets: Dict):
     """Cria cards resumo das projeções"""
     col1, col2, col3, col4 = st.columns(4)
@@ -0,0 +1,184 @@
+# Seleção automática do modelo de projeção por parceiro (backtest)
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from data.fetch_data import fetch_planilha_versionada
+from data.partner_data import montar_matriz_vendas_mensais
+from utils.backtest import MODELOS, executar_backtest
+
+# Processos do backtest de seleção: metade dos núcleos, para não disputar
+# a CPU inteira com as sessões (o backtest sempre roda fora do servidor)
+PROCESSOS_SELECAO = max(1, (os.cpu_count() or 1) // 2)
+
+logger = logging.getLogger(__name__)
+
+
+class ModeloVencedor:
+    """
+    Modelo com menor erro médio absoluto no backtest do parceiro,
+    com o erro de cada candidato avaliado
+    """
+
+    def __init__(self, modelo: str, erros: Dict[str, float],
+                 avaliacoes: int):
+        self.modelo = modelo
+        self.erros = erros
+        self.avaliacoes = avaliacoes
+
+    @property
+    def mae(self) -> float:
+        return self.erros[self.modelo]
+
+
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=1,
+                               thread_name_prefix='selecao-modelo')
+
+# (parceiro, hash da série mensal) -> vencedor: parceiros cuja série não
+# mudou entre versões (ex.: só entrou uma venda nova na base) reaproveitam
+# o vencedor sem novo backtest. None: série avaliada sem histórico
+# suficiente para o backtest (segue com MODELO_PADRAO)
+_vencedores: Dict[Tuple[str, str], Optional[ModeloVencedor]] = {}
+
+# Tabela publicada (parceiro -> vencedor) e a versão dos dados dela; fica
+# em uso até a tabela da versão nova estar pronta
+_tabela: Dict[str, ModeloVencedor] = {}
+_versao_tabela: Optional[str] = None
+
+# Última versão pedida e a seleção que aguarda o trabalhador
+_versao_solicitada: Optional[str] = None
+_pendente: Optional[Tuple[str, pd.DataFrame]] = None
+
+
+def escolher_vencedores(detalhes: pd.DataFrame) -> Dict[str, ModeloVencedor]:
+    """
+    Vencedor por parceiro a partir dos detalhes de executar_backtest.
+    Empates ficam com o modelo que vem antes em MODELOS (o mais barato).
+    """
+    erros = (detalhes['projecao'] - detalhes['real']).abs()
+    mae = erros.groupby([detalhes['parceiro'], detalhes['modelo']]).mean()
+    avaliacoes = detalhes.groupby('parceiro')['horizonte'].size()
+
+    vencedores = {}
+    for parceiro, erros_parceiro in mae.groupby(level=0):
+        erros_modelo = erros_parceiro.droplevel(0).to_dict()
+        modelo = min(erros_modelo, key=lambda m: (erros_modelo[m],
+                                                  MODELOS.index(m)))
+        vencedores[parceiro] = ModeloVencedor(
+            modelo, erros_modelo, int(avaliacoes[parceiro]))
+
+    return vencedores
+
+
+def hash_serie(valores: np.ndarray) -> str:
+    """Identifica a série mensal do parceiro (mesmos valores, mesmo hash)"""
+    dados = np.ascontiguousarray(valores, dtype=float).tobytes()
+    return hashlib.blake2b(dados, digest_size=8).hexdigest()
+
+
+def _calcular_vencedores(versao: str, df_parceiros: pd.DataFrame) -> None:
+    global _tabela, _versao_tabela, _versao_solicitada
+
+    try:
+        matriz = montar_matriz_vendas_mensais(df_parceiros)
+        series = {
+            str(parceiro): hash_serie(valores)
+            for parceiro, valores in zip(matriz.index, matriz.to_numpy())
+        }
+
+        with _lock:
+            novos = [parceiro for parceiro, serie in series.items()
+                     if (parceiro, serie) not in _vencedores]
+
+        vencedores = {}
+        if novos:
+            _, detalhes = executar_backtest(
+                matriz[matriz.index.astype(str).isin(novos)],
+                processos=PROCESSOS_SELECAO,
+                contexto=multiprocessing.get_context('spawn'))
+            vencedores = escolher_vencedores(detalhes)
+    except Exception:
+        logger.exception("Falha na seleção de modelos da versão %s", versao)
+        with _lock:
+            # Permite tentar de novo na próxima consulta
+            if _versao_solicitada == versao:
+                _versao_solicitada = _versao_tabela
+        return
+
+    with _lock:
+        _vencedores.update(
+            ((parceiro, series[parceiro]), vencedores.get(parceiro))
+            for parceiro in novos)
+
+        # Séries que não existem mais deixam de ocupar memória
+        atuais = set(series.items())
+        for chave in [c for c in _vencedores if c not in atuais]:
+            del _vencedores[chave]
+
+        _tabela = {
+            parceiro: _vencedores[(parceiro, serie)]
+            for parceiro, serie in series.items()
+            if _vencedores.get((parceiro, serie)) is not None
+        }
+        _versao_tabela = versao
+
+    logger.info("Seleção de modelos da versão %s: %d parceiros, %d "
+                "reavaliados", versao, len(series), len(novos))
+
+
+def _processar_pendente() -> None:
+    """Roda no trabalhador: só a versão mais recente pedida é calculada"""
+    global _pendente
+
+    with _lock:
+        if _pendente is None:
+            return
+        versao, df_parceiros = _pendente
+        _pendente = None
+
+    _calcular_vencedores(versao, df_parceiros)
+
+
+def solicitar_selecao(versao: str, df_parceiros: pd.DataFrame) -> bool:
+    """
+    Enfileira a seleção da versão (uma vez por versão). Versões que chegam
+    enquanto outra é calculada substituem a pendente, então uma sequência
+    de atualizações incrementais gera no máximo um cálculo em espera.
+    Retorna True se a seleção foi enfileirada agora.
+    """
+    global _versao_solicitada, _pendente
+
+    with _lock:
+        if versao == _versao_solicitada:
+            return False
+        _versao_solicitada = versao
+        _pendente = (versao, df_parceiros)
+
+    _executor.submit(_processar_pendente)
+    return True
+
+
+def consultar_vencedor(parceiro_nome: str) -> Optional[ModeloVencedor]:
+    """
+    Vencedor do parceiro na tabela publicada (consulta em dicionário).
+    Se a tabela é de uma versão anterior dos dados, ela continua valendo
+    e a seleção da versão atual é disparada em segundo plano.
+    """
+    versao, abas = fetch_planilha_versionada('planilha_vendas')
+    if versao is None:
+        return None
+
+    with _lock:
+        vencedor = _tabela.get(parceiro_nome)
+        desatualizada = versao != _versao_tabela
+
+    if desatualizada and abas.get('dados_parceiros') is not None:
+        solicitar_selecao(versao, abas['dados_parceiros'])
+
+    return vencedor
@@ -3,9 +3,49 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 import streamlit as st
-from sklearn.linear_model import LinearRegression
-# Certifique-se de ter statsmodels instalado (pip install statsmodels)
-from statsmodels.tsa.arima.model import ARIMA
+from functools import lru_cache
+
+# Ajustes ARIMA mantidos em memória (séries distintas)
+ARIMA_CACHE_SIZE = 256
+
+# Escolhe o modelo do parceiro pelo backtest (utils.model_selection)
+MODELO_AUTOMATICO = "Automático"
+
+# Usado no modo automático enquanto não há vencedor para o parceiro
+MODELO_PADRAO = "Média de Variação"
+
+
+@lru_cache(maxsize=ARIMA_CACHE_SIZE)
+def _fit_arima(serie: Tuple[float, ...], order: Tuple[int, int, int]):
+    """
+    Ajusta o ARIMA uma única vez por (série, ordem); horizontes e fatores
+    de crescimento diferentes reaproveitam o mesmo ajuste
+    """
+    # Importação adiada: statsmodels é pesado e só o ARIMA precisa dele
+    # Certifique-se de ter statsmodels instalado (pip install statsmodels)
+    from statsmodels.tsa.arima.model import ARIMA
+
+    return ARIMA(list(serie), order=order).fit()
+
+
+def _desvio_residuos_ols(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Desvio padrão dos resíduos da reta de mínimos quadrados de cada linha,
+    em forma fechada e vetorizada (todas as séries de uma vez, dados
+    centrados). x e y: (séries, pontos). Concorda com o LinearRegression
+    do scikit-learn até ~1e-12 relativo; um limite que caia exatamente em
+    .5 pode arredondar diferente. Projeção individual e em lote usam esta
+    mesma função, então as duas sempre coincidem.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    x_c = x - x.mean(axis=1, keepdims=True)
+    y_c = y - y.mean(axis=1, keepdims=True)
+    slope = (x_c * y_c).sum(axis=1) / (x_c ** 2).sum(axis=1)
+
+    # A reta passa pelas médias: resíduo = y_c - inclinação * x_c
+    return (y_c - x_c * slope[:, None]).std(axis=1)
 
 
 class SalesProjector:
@@ -105,28 +145,12 @@ class SalesProjector:
             return self._project_base(
                 vendas_hist[-1] if vendas_hist else 0, 1.0, meses_projecao)
 
-        X = np.array(meses_hist).reshape(-1, 1)
-        y = np.array(vendas_hist)
-
-        model = LinearRegression()
-        model.fit(X, y)
-
-        last_month_num = meses_hist[-1]
-        future_months = np.array([[last_month_num + i + 1]
-                                 for i in range(meses_projecao)])
-
-        predictions = model.predict(future_months)
-
-        # Calcular resíduos para desvio padrão
-        if len(meses_hist) > 1:
-            residuals = y - model.predict(X)
-            std_dev_residuals = np.std(residuals)
-        else:
-            std_dev_residuals = 0.0
+        # Resíduos da reta definem a largura do cone de incerteza
+        std_dev_residuals = _desvio_residuos_ols([meses_hist], [vendas_hist])
 
         # Baseado na tendência
         return self._project_base(
-            vendas_hist[-1], 0.0, meses_projecao, std_dev_residuals)
+            vendas_hist[-1], 0.0, meses_projecao, std_dev_residuals[0])
 
     def _moving_average_projection(
             self, vendas_hist: List[int],
@@ -164,8 +188,8 @@ class SalesProjector:
             # 1,0,0: Apenas um termo AR.
             # Se for muito ruidoso, pode usar (0,1,1) ou (1,1,1).
             # Pode ser (1,0,0) se os dados já forem estacionários
-            model = ARIMA(vendas_hist, order=(1, 1, 0))
-            model_fit = model.fit()
+            model_fit = _fit_arima(
+                tuple(float(v) for v in vendas_hist), (1, 1, 0))
 
             forecast_results = model_fit.get_forecast(steps=meses_projecao)
             predictions = forecast_results.predicted_mean.tolist()
@@ -239,15 +263,34 @@ class SalesProjector:
 
         return last_month_sales
 
+    def _automatic_model(self, parceiro: Optional[str]) -> str:
+        """
+        Modelo vencedor do parceiro na tabela pré-calculada (consulta em
+        dicionário); sem vencedor ainda, usa MODELO_PADRAO
+        """
+        if not parceiro:
+            return MODELO_PADRAO
+
+        # Importação adiada: a seleção roda o backtest, que usa este módulo
+        from utils.model_selection import consultar_vencedor
+
+        vencedor = consultar_vencedor(parceiro)
+        return vencedor.modelo if vencedor else MODELO_PADRAO
+
     def calculate_projections(self, vendas_mensais: Dict[str, int],
                               meses_projecao: int = 6,
                               model_type: str = "Média de Variação",
-                              growth_factor: Optional[float] = None) -> Dict:
+                              growth_factor: Optional[float] = None,
+                              parceiro: Optional[str] = None) -> Dict:
         """
         Calcula projeções mensais e acumuladas usando o modelo selecionado.
-        Pode aplicar um fator de crescimento.
+        Pode aplicar um fator de crescimento. Com model_type "Automático",
+        usa o modelo vencedor do backtest do parceiro (modelo_utilizado).
         """
         try:
+            if model_type == MODELO_AUTOMATICO:
+                model_type = self._automatic_model(parceiro)
+
             meses_hist_nums, vendas_hist = self.prepare_historical_data(
                 vendas_mensais)
 
@@ -267,7 +310,8 @@ class SalesProjector:
                     'vendas_mes_anterior': 0,
                     'mes_atual': datetime.now().month,
                     'confiabilidade': 'Baixa',
-                    'meses_historicos': 0
+                    'meses_historicos': 0,
+                    'modelo_utilizado': model_type
                 }
 
             last_historical_sales = vendas_hist[-1]
@@ -282,24 +326,24 @@ class SalesProjector:
                         last_historical_sales,
                         avg_change, meses_projecao, std_dev_change)
             elif model_type == "Regressão Linear":
-                projecoes_mensais,
-                lower_bounds_mensais, upper_bounds_mensais = \
+                projecoes_mensais, lower_bounds_mensais, \
+                    upper_bounds_mensais = \
                     self._linear_regression_projection(
                         meses_hist_nums, vendas_hist, meses_projecao)
             elif model_type == "Média Móvel":
-                projecoes_mensais,
-                lower_bounds_mensais, upper_bounds_mensais = \
+                projecoes_mensais, lower_bounds_mensais, \
+                    upper_bounds_mensais = \
                     self._moving_average_projection(
                         vendas_hist, meses_projecao)
             elif model_type == "ARIMA":
-                projecoes_mensais,
-                lower_bounds_mensais, upper_bounds_mensais = \
+                projecoes_mensais, lower_bounds_mensais, \
+                    upper_bounds_mensais = \
                     self._arima_projection(vendas_hist, meses_projecao)
             else:  # Fallback para média de variação
                 avg_change, std_dev_change = self._calculate_average_monthly_change(
                     vendas_hist)
-                projecoes_mensais,
-                lower_bounds_mensais, upper_bounds_mensais = \
+                projecoes_mensais, lower_bounds_mensais, \
+                    upper_bounds_mensais = \
                     self._project_base(
                         last_historical_sales,
                         avg_change, meses_projecao, std_dev_change)
@@ -337,7 +381,8 @@ class SalesProjector:
                 'mes_atual': datetime.now().month,
                 'confiabilidade': self._calculate_confidence_simple(
                     vendas_hist),
-                'meses_historicos': len(vendas_hist)
+                'meses_historicos': len(vendas_hist),
+                'modelo_utilizado': model_type
             }
 
         except Exception as e:
@@ -345,6 +390,187 @@ class SalesProjector:
             # Fallback para uma projeção simples em caso de erro
             return self._simple_projection(vendas_mensais, meses_projecao)
 
+    def _historical_matrix(self, matriz: np.ndarray) -> Tuple[
+            np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Versão em lote de prepare_historical_data: para cada linha, os meses
+        com vendas > 0 vão para o início, na ordem original.
+        Retorna (vendas compactadas, números dos meses, quantidade de meses).
+        """
+        positivos = matriz > 0
+        ordem = np.argsort(~positivos, axis=1, kind='stable')
+        vendas = np.take_along_axis(matriz, ordem, axis=1)
+        return vendas, ordem + 1, positivos.sum(axis=1)
+
+    def _project_base_batch(
+            self, last_values: np.ndarray, increments: np.ndarray,
+            meses: int, std_devs: np.ndarray) -> Tuple[
+                np.ndarray, np.ndarray, np.ndarray]:
+        """_project_base para todas as linhas de uma vez (mesma aritmética)"""
+        passos = np.column_stack(
+            [last_values] + [increments] * meses).astype(float)
+        current_vals = np.cumsum(passos, axis=1)[:, 1:]
+
+        uncertainty = std_devs[:, None] * np.sqrt(
+            np.arange(1, meses + 1))[None, :] * 1.5
+
+        return (np.maximum(0, np.round(current_vals)),
+                np.maximum(0, np.round(current_vals - uncertainty)),
+                np.maximum(0, np.round(current_vals + uncertainty)))
+
+    def _monthly_parameters_batch(
+            self, vendas: np.ndarray, meses_hist: np.ndarray,
+            tamanhos: np.ndarray, model_type: str) -> Tuple[
+                np.ndarray, np.ndarray]:
+        """
+        Incremento mensal e desvio padrão de cada linha no modelo escolhido.
+        As linhas são agrupadas pelo tamanho do histórico para que cada
+        estatística seja a mesma redução NumPy do cálculo por parceiro.
+        """
+        increments = np.ones(len(vendas))
+        std_devs = np.zeros(len(vendas))
+
+        for tamanho in np.unique(tamanhos[tamanhos > 0]):
+            linhas = tamanhos == tamanho
+            hist = vendas[linhas, :tamanho]
+            last = hist[:, -1]
+
+            if model_type == "Regressão Linear":
+                if tamanho < 2:
+                    continue
+
+                std_residuos = _desvio_residuos_ols(
+                    meses_hist[linhas, :tamanho], hist)
+
+                increments[linhas] = 0.0
+                std_devs[linhas] = std_residuos
+
+            elif model_type == "Média Móvel":
+                window = hist[:, -3:]
+                increments[linhas] = window.mean(axis=1) - last
+                std_devs[linhas] = window.std(axis=1)
+
+            elif tamanho < 2:  # Média de Variação
+                increments[linhas] = np.maximum(1.0, last * 0.05)
+
+            else:
+                diffs = np.diff(hist, axis=1)
+                average_change = diffs.mean(axis=1)
+
+                # Limite inferior para a média de mudança
+                average_change = np.where(
+                    average_change < -last * 0.5, -last * 0.1, average_change)
+
+                increments[linhas] = average_change
+                std_devs[linhas] = diffs.std(axis=1)
+
+        return increments, std_devs
+
+    def calculate_batch_projections(
+            self, matriz_vendas: pd.DataFrame,
+            meses_projecao: int = 6,
+            model_type: str = "Média de Variação",
+            growth_factor: Optional[float] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Projeções de todos os parceiros de uma vez a partir da matriz
+        parceiros x meses (get_matriz_vendas_mensais). Mesmos valores de
+        calculate_projections, em DataFrames (parceiro x mês projetado):
+        projecoes_mensais, lower/upper_bounds_mensais e as acumuladas,
+        mais 'resumo' com os indicadores por parceiro (para ranking).
+        ARIMA não é vetorizável e roda parceiro a parceiro.
+        """
+        valores = matriz_vendas.to_numpy(dtype=float)
+        vendas, meses_hist, tamanhos = self._historical_matrix(valores)
+        linhas = np.arange(len(vendas))
+        last_values = vendas[linhas, np.maximum(tamanhos - 1, 0)]
+
+        if model_type == "ARIMA":
+            resultados = [
+                self._arima_projection(list(vendas[i, :tamanhos[i]]),
+                                       meses_projecao)
+                for i in linhas]
+            mensais = [np.array([r[k] for r in resultados], dtype=float
+                                ).reshape(len(linhas), meses_projecao)
+                       for k in range(3)]
+        else:
+            if model_type not in ("Regressão Linear", "Média Móvel"):
+                model_type = "Média de Variação"
+
+            increments, std_devs = self._monthly_parameters_batch(
+                vendas, meses_hist, tamanhos, model_type)
+            mensais = list(self._project_base_batch(
+                last_values, increments, meses_projecao, std_devs))
+
+        # Aplicar fator de crescimento do cenário "E se..."
+        if growth_factor is not None:
+            factor = 1 + (growth_factor / 100)
+            mensais = [np.round(m * factor) for m in mensais]
+
+        # Sem histórico: mesmo padrão de calculate_projections
+        sem_historico = tamanhos == 0
+        for m in mensais:
+            m[sem_historico] = 1
+
+        total_atual = np.where(vendas > 0, vendas, 0).sum(axis=1)
+        acumuladas = [total_atual[:, None] + np.cumsum(
+            np.maximum(1, m), axis=1) for m in mensais]
+
+        media = np.zeros(len(vendas))
+        confiabilidade = np.full(len(vendas), 'Baixa', dtype=object)
+        for tamanho in np.unique(tamanhos[tamanhos > 0]):
+            selecao = tamanhos == tamanho
+            hist = vendas[selecao, :tamanho]
+            media[selecao] = np.round(hist.mean(axis=1), 1)
+
+            if 3 <= tamanho < 6:
+                confiabilidade[selecao] = 'Média'
+            elif tamanho >= 6:
+                cv = hist.std(axis=1) / hist.mean(axis=1)
+                confiabilidade[selecao] = np.where(
+                    cv < 0.2, 'Alta', np.where(cv < 0.4, 'Média', 'Baixa'))
+
+        colunas = pd.RangeIndex(1, meses_projecao + 1, name='mes_projetado')
+        nomes = ['projecoes_mensais', 'lower_bounds_mensais',
+                 'upper_bounds_mensais', 'projecoes_acumuladas',
+                 'lower_bounds_acumuladas', 'upper_bounds_acumuladas']
+
+        resultado = {
+            nome: pd.DataFrame(valores_proj.astype(np.int64),
+                               index=matriz_vendas.index, columns=colunas)
+            for nome, valores_proj in zip(nomes, mensais + acumuladas)
+        }
+
+        resultado['resumo'] = pd.DataFrame({
+            'vendas_acumuladas_atual': total_atual,
+            'media_mensal_atual': media,
+            'vendas_mes_anterior': self._previous_month_sales_batch(
+                matriz_vendas),
+            'confiabilidade': confiabilidade,
+            'meses_historicos': tamanhos,
+            'proximo_mes_projecao': resultado['projecoes_mensais'][1],
+            'total_projetado': resultado['projecoes_acumuladas'][
+                meses_projecao]
+        }, index=matriz_vendas.index)
+
+        return resultado
+
+    def _previous_month_sales_batch(
+            self, matriz_vendas: pd.DataFrame) -> np.ndarray:
+        """get_previous_month_sales para todas as linhas da matriz"""
+        mes_atual = datetime.now().month
+        current_year = datetime.now().year
+
+        chaves = [f"{self.meses_nomes[i].lower()[:3]}./{current_year}"
+                  for i in range(1, mes_atual)]
+        chaves = [chave for chave in chaves if chave in matriz_vendas.columns]
+
+        resultado = np.zeros(len(matriz_vendas))
+        for chave in chaves:
+            valores = matriz_vendas[chave].to_numpy(dtype=float)
+            resultado = np.where(valores > 0, valores, resultado)
+
+        return resultado
+
     def _calculate_confidence_simple(self, vendas_hist: List[int]) -> str:
         """Calcula confiança baseado na quantidade e variabilidade dos dados"""
         if len(vendas_hist) < 3:
@@ -0,0 +1,200 @@
+# Fila de relatórios gerados em segundo plano (compartilhada entre sessões)
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from data.fetch_data import fetch_planilha_versionada
+from utils.report_generator import ReportGenerator
+
+# Relatórios gerados ao mesmo tempo; os demais aguardam na fila
+TRABALHADORES = 2
+
+# Bytes de relatórios prontos mantidos em memória (os mais antigos saem)
+LIMITE_BYTES_ARTEFATOS = 256 * 1024 * 1024
+
+# Tarefas lembradas (prontas, com erro ou em andamento)
+LIMITE_TAREFAS = 256
+
+# Gerações repetidas quando a versão dos dados muda durante a geração
+TENTATIVAS_VERSAO = 3
+
+MIME_FORMATOS = {
+    'excel': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'csv': 'text/csv',
+    'pdf': 'application/pdf'
+}
+
+# Tipo de relatório -> formato -> (método do ReportGenerator, argumentos extras)
+GERADORES = {
+    'Resumo de Vendas': {
+        'excel': ('generate_summary_report_excel', {}),
+        'csv': ('generate_csv_report', {'detailed': False}),
+        'pdf': ('generate_pdf_report', {'detailed': False})
+    },
+    'Dados Detalhados': {
+        'excel': ('generate_detailed_report_excel', {}),
+        'csv': ('generate_csv_report', {'detailed': True}),
+        'pdf': ('generate_pdf_report', {'detailed': True})
+    },
+    'Inadimplentes': {
+        'excel': ('generate_inadimplentes_excel', {}),
+        'csv': ('generate_inadimplentes_csv', {}),
+        'pdf': ('generate_inadimplentes_pdf', {})
+    }
+}
+
+# (versão dos dados, parceiro, tipo, formato, ano, mês, modalidades)
+ChaveRelatorio = Tuple[str, str, str, str, Optional[int], Optional[int],
+                       Tuple[str, ...]]
+
+logger = logging.getLogger(__name__)
+
+
+class TarefaRelatorio:
+    """
+    Relatório pedido à fila; compartilhado entre sessões e reruns.
+    status: 'na fila', 'gerando', 'concluído' ou 'erro'
+    """
+
+    def __init__(self, chave: ChaveRelatorio):
+        self.chave = chave
+        self.status = 'na fila'
+        self.progresso = 0.0
+        self.mensagem = ''
+        self.dados: Optional[bytes] = None
+
+    @property
+    def em_andamento(self) -> bool:
+        return self.status in ('na fila', 'gerando')
+
+
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=TRABALHADORES,
+                               thread_name_prefix='relatorio')
+_tarefas: 'OrderedDict[ChaveRelatorio, TarefaRelatorio]' = OrderedDict()
+
+
+def _versao_atual() -> Optional[str]:
+    versao, _ = fetch_planilha_versionada('planilha_vendas')
+    return versao
+
+
+def chave_relatorio(parceiro_nome: str, tipo: str, formato: str,
+                    ano: Optional[int], mes: Optional[int],
+                    modalidades: Optional[List[str]]
+                    ) -> Optional[ChaveRelatorio]:
+    """
+    Chave do relatório na versão atual dos dados (None sem dados)
+    """
+    versao = _versao_atual()
+
+    if versao is None:
+        return None
+
+    return (versao, parceiro_nome, tipo, formato, ano, mes,
+            tuple(modalidades or ()))
+
+
+def _liberar_espaco() -> None:
+    """Descarta as tarefas menos usadas acima dos limites (com _lock)"""
+    total_bytes = sum(len(tarefa.dados or b'') for tarefa in _tarefas.values())
+
+    for chave in list(_tarefas):
+        if (len(_tarefas) <= LIMITE_TAREFAS and
+                total_bytes <= LIMITE_BYTES_ARTEFATOS):
+            break
+
+        tarefa = _tarefas[chave]
+        if tarefa.em_andamento:
+            continue
+
+        total_bytes -= len(tarefa.dados or b'')
+        del _tarefas[chave]
+
+
+def _rechavear(tarefa: TarefaRelatorio, versao: str) -> None:
+    """
+    Move a tarefa para a chave da versão com que o relatório foi gerado
+    (com _lock): bytes de uma versão nunca ficam sob a chave de outra
+    """
+    if _tarefas.get(tarefa.chave) is tarefa:
+        del _tarefas[tarefa.chave]
+
+    tarefa.chave = (versao,) + tarefa.chave[1:]
+    existente = _tarefas.get(tarefa.chave)
+    if existente is None or existente.status == 'erro':
+        _tarefas[tarefa.chave] = tarefa
+
+
+def _executar(tarefa: TarefaRelatorio) -> None:
+    _, parceiro_nome, tipo, formato, ano, mes, modalidades = tarefa.chave
+    metodo, extras = GERADORES[tipo][formato]
+
+    def progredir(fracao: float) -> None:
+        tarefa.progresso = fracao
+
+    tarefa.status = 'gerando'
+    gerador = ReportGenerator(ao_progredir=progredir, propagar_erros=True)
+    try:
+        # Os get_* do gerador leem a versão atual, que pode mudar por uma
+        # revalidação no meio da geração: só vale uma geração que começou
+        # e terminou na mesma versão
+        for _ in range(TENTATIVAS_VERSAO):
+            versao = _versao_atual()
+            dados = getattr(gerador, metodo)(
+                parceiro_nome, ano, mes, list(modalidades) or None, **extras)
+            if _versao_atual() == versao:
+                break
+        else:
+            raise RuntimeError("os dados foram atualizados durante a "
+                               "geração; tente novamente")
+
+        if versao is not None and versao != tarefa.chave[0]:
+            with _lock:
+                _rechavear(tarefa, versao)
+    except Exception as e:
+        logger.exception("Falha ao gerar relatório %s", tarefa.chave)
+        dados = b""
+        tarefa.mensagem = f"Erro ao gerar relatório: {str(e)}"
+
+    if dados:
+        tarefa.dados = dados
+        tarefa.progresso = 1.0
+        tarefa.status = 'concluído'
+    else:
+        # Sem erro, vazio significa que não há dados para os filtros
+        tarefa.mensagem = tarefa.mensagem or gerador.aviso or (
+            "Nenhum dado encontrado para os filtros selecionados.")
+        tarefa.status = 'erro'
+
+    with _lock:
+        _liberar_espaco()
+
+
+def solicitar_relatorio(chave: ChaveRelatorio) -> TarefaRelatorio:
+    """
+    Enfileira o relatório; se já existe (pronto ou em andamento) para a
+    mesma chave, devolve a tarefa existente sem gerar de novo
+    """
+    if chave[2] not in GERADORES or chave[3] not in MIME_FORMATOS:
+        raise ValueError(f"Relatório desconhecido: {chave[2]} / {chave[3]}")
+
+    with _lock:
+        tarefa = _tarefas.get(chave)
+        if tarefa is not None and tarefa.status != 'erro':
+            _tarefas.move_to_end(chave)
+            return tarefa
+
+        tarefa = TarefaRelatorio(chave)
+        _tarefas[chave] = tarefa
+        _liberar_espaco()
+
+    _executor.submit(_executar, tarefa)
+    return tarefa
+
+
+def consultar_relatorio(chave: ChaveRelatorio) -> Optional[TarefaRelatorio]:
+    """Tarefa já pedida para a chave (de qualquer sessão) ou None"""
+    with _lock:
+        return _tarefas.get(chave)
@@ -0,0 +1,86 @@
+# Exportação de planilhas Excel em blocos, com memória constante
+import tempfile
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from typing import Callable, IO, Iterable, Iterator, List, Optional
+
+# Linhas formatadas por vez: só um bloco fica materializado em memória
+TAMANHO_BLOCO = 5000
+
+# Acima deste tamanho o arquivo gerado sai da memória para o disco
+LIMITE_MEMORIA_ARQUIVO = 32 * 1024 * 1024
+
+
+def novo_arquivo(limite: int = LIMITE_MEMORIA_ARQUIVO) -> IO[bytes]:
+    """Arquivo temporário em memória que passa para o disco se crescer"""
+    return tempfile.SpooledTemporaryFile(max_size=limite, mode='w+b')
+
+
+def ler_arquivo(arquivo: IO[bytes]) -> bytes:
+    """Conteúdo completo do arquivo gerado (fecha o arquivo)"""
+    with arquivo:
+        arquivo.seek(0)
+        return arquivo.read()
+
+
+def abrir_workbook(arquivo: IO[bytes]) -> xlsxwriter.Workbook:
+    """
+    Workbook em modo constant_memory: cada linha vai para o disco assim
+    que a próxima começa, então as linhas devem ser escritas em ordem
+    """
+    return xlsxwriter.Workbook(arquivo, {'constant_memory': True})
+
+
+def blocos_dataframe(df: pd.DataFrame, colunas: List[str],
+                     ordem: Optional[np.ndarray] = None,
+                     formatar: Optional[Callable[[pd.DataFrame],
+                                                 pd.DataFrame]] = None,
+                     tamanho_bloco: int = TAMANHO_BLOCO,
+                     ao_avancar: Optional[Callable[[float], None]] = None
+                     ) -> Iterator[pd.DataFrame]:
+    """
+    Percorre as colunas do DataFrame em blocos (na ordem de posições
+    informada), aplicando a formatação de exportação bloco a bloco.
+    ao_avancar recebe a fração já entregue (0 a 1) a cada bloco.
+    """
+    if ordem is None:
+        ordem = np.arange(len(df))
+    posicoes_colunas = df.columns.get_indexer(colunas)
+
+    for inicio in range(0, len(ordem), tamanho_bloco):
+        bloco = df.iloc[ordem[inicio:inicio + tamanho_bloco],
+                        posicoes_colunas]
+        yield formatar(bloco) if formatar else bloco
+
+        if ao_avancar:
+            ao_avancar(min(inicio + tamanho_bloco, len(ordem)) / len(ordem))
+
+
+def linhas_dos_blocos(blocos: Iterable[pd.DataFrame]) -> Iterator[tuple]:
+    """Tuplas de valores Python por linha; ausentes viram células vazias"""
+    for bloco in blocos:
+        valores = bloco.astype(object)
+        yield from valores.where(valores.notna(), None).itertuples(
+            index=False, name=None)
+
+
+def escrever_aba(worksheet, colunas: List[str], linhas: Iterable[tuple],
+                 formato_cabecalho=None) -> int:
+    """
+    Escreve cabeçalho e linhas em sequência; retorna o total de linhas
+    """
+    worksheet.write_row(0, 0, colunas, formato_cabecalho)
+
+    total = 0
+    for total, linha in enumerate(linhas, start=1):
+        worksheet.write_row(total, 0, linha)
+
+    return total
+
+
+def escrever_dataframe(worksheet, df: pd.DataFrame,
+                       formato_cabecalho=None) -> int:
+    """Atalho para abas pequenas (resumos) já montadas em um DataFrame"""
+    return escrever_aba(worksheet, list(df.columns),
+                        linhas_dos_blocos([df]), formato_cabecalho)